@@ -13,6 +13,9 @@ DEFAULT_SIZE_ID = "1"      # change to a web JPEG/PNG size_id if originals 403/A
 FETCH_IMAGES = True        # set False for even faster runs
 MAX_WORKERS = 12
 TIMEOUT = (5, 20)          # (connect, read) seconds
+# Only the employee keys fetch_employee() reads; keeps the payload small
+EMPLOYEE_FIELDS = ("id", "first_name", "last_name", "job_title", "email", "work_phone",
+                   "title", "studio_office", "office", "hero_image_id", "files")
 
 # ---- Session with keep-alive + retries ----
 session = requests.Session()
@@ -120,7 +123,7 @@ def fetch_employee(emp_id):
     try:
         er = session.get(
             f"{BASE_URL}/Employees/{emp_id}",
-            params={"withHeroImage": 1, "files": 1},
+            params={"withHeroImage": 1, "files": 1, "displayFields": ",".join(EMPLOYEE_FIELDS)},
             timeout=TIMEOUT
         )
         if not er.ok:
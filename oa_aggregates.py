@@ -0,0 +1,188 @@
+"""
+Materialized per-employee experience aggregates (employee_experience.csv).
+
+One row per employee with project counts per practice area, sub-practice
+area and region ("practice_area.Healthcare", "region.East", ...), the first
+and last project year and the numeric experience fields, so combined
+"project details + people details" filters become a single-table scan.
+
+Given the previous table and a change feed (oa_changes.py), only employees
+touched by changed links, changed projects or changed employee records are
+recomputed; every other row is carried over.
+
+    python oa_aggregates.py Data
+    python oa_aggregates.py Data --previous OLD --changes Data/changes.ndjson
+"""
+import argparse
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from openasset_export import read_csv, write_csv
+
+AGGREGATES_FILE = "employee_experience.csv"
+BASE_COLUMNS = ["EmployeeID", "projects", "first_project_year", "last_project_year",
+                "total_years_in_industry", "current_years_with_this_firm"]
+# aggregate prefix -> project columns to read it from (first non-empty wins)
+CATEGORY_COLUMNS = {
+    "practice_area": ["practice_area", "field.practice_area"],
+    "sub_practice_area": ["sub_practice_areas", "sub_practice_area"],
+    "region": ["region"],
+}
+YEAR_COLUMNS = ["field.year_completed", "field.completion_date"]
+EXPERIENCE_COLUMNS = ["total_years_in_industry", "current_years_with_this_firm"]
+
+_YEAR = re.compile(r"(?<!\d)(19|20)\d{2}")
+
+
+def _s(v: Any) -> str:
+    return "" if v is None else str(v)
+
+
+def project_year(p: Dict[str, Any]) -> Optional[int]:
+    for col in YEAR_COLUMNS:
+        m = _YEAR.search(_s(p.get(col)))
+        if m:
+            return int(m.group(0))
+    return None
+
+
+def number(v: Any) -> str:
+    """'12' / '12.5' / ' 3,000 ' -> normalized number string; anything else (N/A, '') -> ''."""
+    txt = _s(v).replace(",", "").strip()
+    try:
+        f = float(txt)
+    except ValueError:
+        return ""
+    return str(int(f)) if f.is_integer() else str(f)
+
+
+def project_facts(projects: Iterable[Dict[str, Any]]) -> Dict[str, Tuple[Dict[str, List[str]], Optional[int]]]:
+    """ProjectID -> ({prefix: [values]}, year), computed once per project."""
+    out = {}
+    for p in projects:
+        cats: Dict[str, List[str]] = {}
+        for prefix, cols in CATEGORY_COLUMNS.items():
+            raw = next((_s(p.get(c)) for c in cols if _s(p.get(c)).strip()), "")
+            cats[prefix] = [v.strip() for v in raw.split(";") if v.strip()]
+        out[_s(p.get("id"))] = (cats, project_year(p))
+    return out
+
+
+def employee_row(eid: str, employee: Dict[str, Any], project_ids: Iterable[str],
+                 facts: Dict[str, Tuple[Dict[str, List[str]], Optional[int]]]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"EmployeeID": eid, "projects": 0, "first_project_year": "", "last_project_year": ""}
+    years: List[int] = []
+    for pid in set(project_ids):
+        if pid not in facts:
+            continue
+        cats, year = facts[pid]
+        row["projects"] += 1
+        if year:
+            years.append(year)
+        for prefix, values in cats.items():
+            for v in values:
+                key = f"{prefix}.{v}"
+                row[key] = row.get(key, 0) + 1
+    if years:
+        row["first_project_year"], row["last_project_year"] = min(years), max(years)
+    for col in EXPERIENCE_COLUMNS:
+        row[col] = number(employee.get(col))
+    return row
+
+
+def _employee_id(e: Dict[str, Any]) -> str:
+    return _s(e.get("EmployeeID") or e.get("id"))
+
+
+def compute_aggregates(employees: List[Dict[str, Any]], projects: List[Dict[str, Any]],
+                       links: List[Dict[str, Any]], only: Optional[Set[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """EmployeeID -> aggregate row, for every employee (or just `only`)."""
+    facts = project_facts(projects)
+    by_employee: Dict[str, List[str]] = {}
+    for link in links:
+        by_employee.setdefault(_s(link.get("EmployeeID")), []).append(_s(link.get("ProjectID")))
+    out = {}
+    for e in employees:
+        eid = _employee_id(e)
+        if eid and (only is None or eid in only):
+            out[eid] = employee_row(eid, e, by_employee.get(eid, []), facts)
+    return out
+
+
+def affected_employees(changes: Iterable[Dict[str, Any]], links: List[Dict[str, Any]]) -> Set[str]:
+    """Employees whose aggregates a change feed can have altered."""
+    touched: Set[str] = set()
+    projects: Set[str] = set()
+    for rec in changes:
+        if rec["table"] == "links":
+            touched.add(_s(rec["id"][1]))
+        elif rec["table"] == "employees":
+            touched.add(_s(rec["id"]))
+        elif rec["table"] == "projects":
+            projects.add(_s(rec["id"]))
+    for link in links:
+        if _s(link.get("ProjectID")) in projects:
+            touched.add(_s(link.get("EmployeeID")))
+    return touched
+
+
+def build_aggregates(outdir: Path, employees: List[Dict[str, Any]], projects: List[Dict[str, Any]],
+                     links: List[Dict[str, Any]], previous: Optional[Path] = None,
+                     changes: Optional[List[Dict[str, Any]]] = None) -> Tuple[int, int]:
+    """
+    Write employee_experience.csv; incremental when `previous` (a snapshot dir
+    holding the old table) and `changes` are given. Returns (rows, recomputed).
+    """
+    prev_path = Path(previous) / AGGREGATES_FILE if previous else None
+    if prev_path and prev_path.exists() and changes is not None:
+        _, prev_rows = read_csv(prev_path)
+        current = {_employee_id(e) for e in employees}
+        # zero counts are padding from the old header; dropping them lets categories
+        # that no longer occur anywhere fall out of the new header
+        rows = {r["EmployeeID"]: {k: v for k, v in r.items() if k in BASE_COLUMNS or v not in ("", "0")}
+                for r in prev_rows if r["EmployeeID"] in current}
+        redo = affected_employees(changes, links) | (current - set(rows))
+        rows.update(compute_aggregates(employees, projects, links, only=redo))
+    else:
+        rows = compute_aggregates(employees, projects, links)
+        redo = set(rows)
+
+    counts = sorted({k for r in rows.values() for k in r if k not in BASE_COLUMNS})
+    header = BASE_COLUMNS + counts
+    ordered = [rows[k] for k in sorted(rows, key=lambda v: (0, int(v)) if v.isdigit() else (1, v))]
+    for r in ordered:
+        for c in counts:
+            if r.get(c) in (None, ""):
+                r[c] = 0
+    write_csv(Path(outdir) / AGGREGATES_FILE, ordered, header)
+    return len(ordered), len(redo & set(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-employee experience aggregates from an export snapshot")
+    parser.add_argument("outdir", help="Snapshot directory with the three CSVs")
+    parser.add_argument("--previous", type=str, default=None,
+                        help="Snapshot directory holding the previous employee_experience.csv")
+    parser.add_argument("--changes", type=str, default=None,
+                        help="Change feed (oa_changes.py) between --previous and outdir")
+    args = parser.parse_args()
+
+    outdir = Path(args.outdir)
+    changes = None
+    if args.changes:
+        from oa_changes import read_change_feed
+        changes = list(read_change_feed(Path(args.changes)))
+    n, redone = build_aggregates(
+        outdir,
+        read_csv(outdir / "employees.csv")[1],
+        read_csv(outdir / "projects.csv")[1],
+        read_csv(outdir / "project_employees.csv")[1],
+        previous=Path(args.previous) if args.previous else None,
+        changes=changes,
+    )
+    print(f"Wrote {n} rows ({redone} recomputed) to {outdir / AGGREGATES_FILE}")
+
+
+if __name__ == "__main__":
+    main()
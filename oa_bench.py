@@ -0,0 +1,241 @@
+"""
+Micro-benchmarks for the per-record / per-URL hot paths of the exporter.
+
+Synthetic records are cloned from the rows in Data/employees.csv and
+Data/projects.csv (unflattened back into nested JSON like the API returns)
+and replayed at 1x, 10x and 100x the snapshot size.
+
+    python oa_bench.py                      # run, compare against bench_baseline.json
+    python oa_bench.py --save-baseline      # record the current numbers as the baseline
+    python oa_bench.py --only flatten --scales 100
+
+For every benchmark we record ops/s (best of --repeat runs, each repeating
+the batch for at least --min-time seconds so small 1x batches are not
+dominated by timer noise) and the peak traced allocation (tracemalloc) of
+one batch. The exit code is 1 when any
+benchmark is slower, or allocates more, than the stored baseline by more
+than --threshold.
+"""
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import dig_poc
+import openasset_export as oe
+
+DATA_DIR = Path(__file__).resolve().parent / "Data"
+BASELINE_DEFAULT = "bench_baseline.json"
+MIN_TIME_DEFAULT = 0.2
+
+_SEGMENT = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+# ========= Synthetic data =========
+def unflatten(row: Dict[str, str]) -> Dict[str, Any]:
+    """Inverse of openasset_export.flatten for 'a.b[0].c' keys; empty cells are dropped.
+    'field.*' keys stay flat, as the exporter merges them that way."""
+    out: Dict[str, Any] = {}
+    for key, value in row.items():
+        if value in (None, ""):
+            continue
+        if key.startswith("field."):
+            out[key] = value
+            continue
+        parts = [name if name else int(idx) for name, idx in _SEGMENT.findall(key)]
+        node: Any = out
+        for part, nxt in zip(parts, parts[1:]):
+            if isinstance(part, int):
+                while len(node) <= part:
+                    node.append(None)
+                if node[part] is None:
+                    node[part] = [] if isinstance(nxt, int) else {}
+                node = node[part]
+            else:
+                if part not in node or not isinstance(node[part], (dict, list)):
+                    node[part] = [] if isinstance(nxt, int) else {}
+                node = node[part]
+        last = parts[-1]
+        if isinstance(last, int):
+            while len(node) <= last:
+                node.append(None)
+            node[last] = value
+        elif isinstance(node, dict):
+            node[last] = value
+    return out
+
+
+def _clone(records: List[Dict[str, Any]], scale: int, id_key: str) -> List[Dict[str, Any]]:
+    out = []
+    for n in range(scale):
+        for r in records:
+            c = json.loads(json.dumps(r))
+            c[id_key] = f"{r.get(id_key, '')}{n:04d}"
+            out.append(c)
+    return out
+
+
+def synthetic(scale: int) -> Dict[str, Any]:
+    _, emp_rows = oe.read_csv(DATA_DIR / "employees.csv")
+    _, proj_rows = oe.read_csv(DATA_DIR / "projects.csv")
+    employees = _clone([unflatten(r) for r in emp_rows], scale, "id")
+    projects = _clone([unflatten(r) for r in proj_rows], scale, "id")
+    # Field items as returned by /Projects/{id}/Fields: scalar, multi-value and grid shapes
+    field_items = []
+    for p in projects:
+        for k, v in p.items():
+            if k.startswith("field."):
+                if ";" in v:
+                    field_items.append({"id": 1, "values": [s.strip() for s in v.split(";")]})
+                else:
+                    field_items.append({"id": 1, "value": v})
+        field_items.append({"id": 2, "rows": [{"_row": 0, "year": "2020"}], "total": 1, "limit": 10, "offset": 0})
+    # Hero image URLs with the whitespace damage _sanitize_url exists to repair
+    urls = [f"https://perkinseastman.openasset.com/ Images/N{i % 997} .tif%20/size {i % 7}?v= {i}"
+            for i in range(len(employees))]
+    return {"employees": employees, "projects": projects, "field_items": field_items, "urls": urls}
+
+
+# ========= Benchmarks =========
+# Each entry builds (callable, ops[, cleanup]) from the synthetic data; the callable runs the
+# whole batch once, and cleanup (if given) releases whatever the setup created.
+def _bench_flatten(d):
+    recs = d["employees"] + d["projects"]
+    return (lambda: [oe.flatten(r) for r in recs]), len(recs)
+
+def _bench_unique_headers(d):
+    flat = [oe.flatten(r) for r in d["employees"]]
+    return (lambda: oe.unique_headers(flat)), len(flat)
+
+def _bench_write_csv(d):
+    flat = [oe.flatten(r) for r in d["employees"]]
+    header = oe.unique_headers(flat)
+    tmpdir = tempfile.TemporaryDirectory(prefix="oa_bench_")
+    tmp = Path(tmpdir.name) / "employees.csv"
+    return (lambda: oe.write_csv(tmp, flat, header)), len(flat), tmpdir.cleanup
+
+def _bench_extract_friendly_columns(d):
+    recs = d["projects"]
+    return (lambda: [oe.extract_friendly_columns(r) for r in recs]), len(recs)
+
+def _bench_normalize_field_value(d):
+    items = d["field_items"]
+    return (lambda: [oe.normalize_field_value(i) for i in items]), len(items)
+
+def _bench_sanitize_url(d):
+    urls = d["urls"]
+    return (lambda: [dig_poc._sanitize_url(u) for u in urls]), len(urls)
+
+def _bench_clean_ws_like(d):
+    vals = [e.get("email", "") + " \u200b" + e.get("work_phone", "") for e in d["employees"]]
+    return (lambda: [dig_poc._clean_ws_like(v) for v in vals]), len(vals)
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, Any]], Tuple[Any, ...]]] = {
+    "flatten": _bench_flatten,
+    "unique_headers": _bench_unique_headers,
+    "write_csv": _bench_write_csv,
+    "extract_friendly_columns": _bench_extract_friendly_columns,
+    "normalize_field_value": _bench_normalize_field_value,
+    "_sanitize_url": _bench_sanitize_url,
+    "_clean_ws_like": _bench_clean_ws_like,
+}
+
+
+def measure(fn: Callable[[], Any], ops: int, repeat: int, min_time: float = MIN_TIME_DEFAULT) -> Dict[str, float]:
+    best = float("inf")  # seconds per batch
+    for _ in range(repeat):
+        loops = 0
+        t0 = time.perf_counter()
+        while True:
+            fn()
+            loops += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / loops)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops": ops, "ops_per_s": ops / best if best > 0 else float("inf"), "peak_kib": peak / 1024}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    failures = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if cur["ops_per_s"] < base["ops_per_s"] * (1 - threshold):
+            failures.append(f"{name}: {cur['ops_per_s']:,.0f} ops/s vs baseline {base['ops_per_s']:,.0f}")
+        if cur["peak_kib"] > base["peak_kib"] * (1 + threshold):
+            failures.append(f"{name}: peak {cur['peak_kib']:,.0f} KiB vs baseline {base['peak_kib']:,.0f}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exporter hot paths on synthetic data")
+    parser.add_argument("--scales", type=str, default="1,10,100",
+                        help="Comma-separated multiples of the Data/ snapshot size (default: 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per benchmark; the best one counts (default: 3)")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_DEFAULT,
+                        help=f"Minimum seconds per timed run; the batch is repeated until reached "
+                             f"(default: {MIN_TIME_DEFAULT})")
+    parser.add_argument("--only", type=str, default=None,
+                        help="Comma-separated benchmark names to run")
+    parser.add_argument("--baseline", type=str, default=BASELINE_DEFAULT,
+                        help=f"Baseline JSON file (default: {BASELINE_DEFAULT})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write the results to --baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed regression as a fraction of the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)}. Choose from: {', '.join(BENCHMARKS)}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'benchmark':<36} {'ops':>8} {'ops/s':>14} {'peak KiB':>10}")
+    for scale in (int(s) for s in args.scales.split(",")):
+        data = synthetic(scale)
+        for name in names:
+            fn, ops, *cleanup = BENCHMARKS[name](data)
+            key = f"{name}@{scale}x"
+            try:
+                results[key] = r = measure(fn, ops, args.repeat, args.min_time)
+            finally:
+                for done in cleanup:
+                    done()
+            print(f"{key:<36} {ops:>8} {r['ops_per_s']:>14,.0f} {r['peak_kib']:>10,.0f}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        with baseline_path.open("w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to record one.")
+        return
+    with baseline_path.open("r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    failures = compare(results, baseline, args.threshold)
+    if failures:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for line in failures:
+            print(f"  ⚠️  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {baseline_path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Row-level change feed between two export snapshots.
+
+Every flattened row is hashed by its ID; comparing the digests of two runs
+gives added / removed / changed records for projects, employees, bridge
+edges and the role dictionary, written as NDJSON (one JSON object per line):
+
+    {"table": "projects", "op": "changed", "id": "172", "row": {...}}
+    {"table": "links", "op": "removed", "id": ["172", "3714"]}
+
+    python oa_changes.py OLD_DIR NEW_DIR --out changes.ndjson
+
+openasset_export.py runs the same diff with --changes-from.
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from openasset_export import read_csv
+
+# table name -> (file name, id columns)
+TABLES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "projects": ("projects.csv", ("id",)),
+    "employees": ("employees.csv", ("EmployeeID",)),
+    "links": ("project_employees.csv", ("ProjectID", "EmployeeID")),
+    "roles": ("project_roles.csv", ("RoleID",)),
+}
+
+Key = Tuple[str, ...]
+
+
+def cell(v: Any) -> str:
+    """The string csv.writer would store for v."""
+    return "" if v is None else str(v)
+
+
+def compact_row(row: Dict[str, Any]) -> Dict[str, str]:
+    # Empty cells are dropped so a column added elsewhere in the table
+    # does not make every row look changed.
+    return {k: cell(v) for k, v in row.items() if cell(v) != ""}
+
+
+def row_digest(row: Dict[str, Any]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for k, v in sorted(compact_row(row).items()):
+        h.update(k.encode("utf-8"))
+        h.update(b"\x1f")
+        h.update(v.encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def row_key(row: Dict[str, Any], id_cols: Tuple[str, ...]) -> Key:
+    return tuple(cell(row.get(c)) for c in id_cols)
+
+
+def table_digests(rows: Iterable[Dict[str, Any]], id_cols: Tuple[str, ...]) -> Dict[Key, str]:
+    return {row_key(r, id_cols): row_digest(r) for r in rows}
+
+
+def snapshot_digests(snapshot_dir: Path) -> Dict[str, Dict[Key, str]]:
+    """Digests for every table of a snapshot directory; missing files count as empty."""
+    out: Dict[str, Dict[Key, str]] = {}
+    for table, (fname, id_cols) in TABLES.items():
+        path = snapshot_dir / fname
+        if not path.exists():
+            out[table] = {}
+            continue
+        _, rows = read_csv(path)
+        out[table] = table_digests(rows, id_cols)
+    return out
+
+
+def _record(table: str, op: str, key: Key, row: Dict[str, Any] = None) -> Dict[str, Any]:
+    rec: Dict[str, Any] = {"table": table, "op": op, "id": key[0] if len(key) == 1 else list(key)}
+    if row is not None:
+        rec["row"] = compact_row(row)
+    return rec
+
+
+def diff_table(table: str, old: Dict[Key, str], rows: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    id_cols = TABLES[table][1]
+    seen = set()
+    for r in rows:
+        key = row_key(r, id_cols)
+        seen.add(key)
+        prev = old.get(key)
+        if prev is None:
+            yield _record(table, "added", key, r)
+        elif prev != row_digest(r):
+            yield _record(table, "changed", key, r)
+    for key in old:
+        if key not in seen:
+            yield _record(table, "removed", key)
+
+
+def diff_snapshot(old: Dict[str, Dict[Key, str]], new_rows: Dict[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Compare previous digests against the freshly built rows of each table."""
+    for table in TABLES:
+        yield from diff_table(table, old.get(table, {}), new_rows.get(table, []))
+
+
+def write_change_feed(path: Path, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    counts = {"added": 0, "removed": 0, "changed": 0}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="\n") as f:
+        for rec in records:
+            counts[rec["op"]] += 1
+            f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+    return counts
+
+
+def read_change_feed(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Row-level change feed between two export snapshots")
+    parser.add_argument("old", help="Previous snapshot directory")
+    parser.add_argument("new", help="Current snapshot directory")
+    parser.add_argument("--out", type=str, default="changes.ndjson",
+                        help="NDJSON output path (default: changes.ndjson)")
+    args = parser.parse_args()
+
+    new_dir = Path(args.new)
+    new_rows = {table: read_csv(new_dir / fname)[1] if (new_dir / fname).exists() else []
+                for table, (fname, _) in TABLES.items()}
+    counts = write_change_feed(Path(args.out), diff_snapshot(snapshot_digests(Path(args.old)), new_rows))
+    print(f"{args.out}: +{counts['added']} -{counts['removed']} ~{counts['changed']}")
+
+
+if __name__ == "__main__":
+    main()
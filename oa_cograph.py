@@ -0,0 +1,132 @@
+"""
+Co-worker graph: who has worked with whom, from project_employees.csv.
+
+The bridge is turned into a sparse employee x project incidence matrix B;
+C = B @ B.T is then the weighted co-occurrence graph (C[i, j] = number of
+projects i and j share). The top-k collaborators per employee are written to
+collaborators.csv, so "top collaborators of X" is a lookup:
+
+    python oa_cograph.py Data --top 10
+    python oa_cograph.py Data --employee 3714
+    python oa_cograph.py Data --team 3714,4789
+"""
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from openasset_export import read_csv, write_csv
+
+COLLABORATORS_FILE = "collaborators.csv"
+COLLABORATORS_HEADER = ["EmployeeID", "Rank", "CollaboratorID", "SharedProjects"]
+TOP_K_DEFAULT = 10
+
+
+def _ids(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct ids (sorted) and the code of each value into them."""
+    uniq, codes = np.unique(np.asarray([int(v) for v in values], dtype=np.int64), return_inverse=True)
+    return uniq, codes
+
+
+class CoworkerGraph:
+    def __init__(self, links: List[Dict[str, Any]]):
+        links = [l for l in links if l.get("ProjectID") not in (None, "") and l.get("EmployeeID") not in (None, "")]
+        self.employee_ids, emp_codes = _ids(l["EmployeeID"] for l in links)
+        self.project_ids, proj_codes = _ids(l["ProjectID"] for l in links)
+        n_emp, n_proj = len(self.employee_ids), len(self.project_ids)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(links), dtype=np.int32), (emp_codes, proj_codes)), shape=(n_emp, n_proj)
+        )
+        incidence.sum_duplicates()
+        incidence.data = np.minimum(incidence.data, 1)  # duplicate bridge rows must not count twice
+        co = (incidence @ incidence.T).tocsr()
+        co.setdiag(0)
+        co.eliminate_zeros()
+        self.incidence = incidence
+        self.weights = co
+        self._code = {int(e): i for i, e in enumerate(self.employee_ids)}
+
+    def top_k(self, k: int = TOP_K_DEFAULT) -> Dict[int, List[Tuple[int, int]]]:
+        """EmployeeID -> [(CollaboratorID, shared projects), ...], most shared first (ties by id)."""
+        out: Dict[int, List[Tuple[int, int]]] = {}
+        w = self.weights
+        for i, eid in enumerate(self.employee_ids):
+            start, end = w.indptr[i], w.indptr[i + 1]
+            if start == end:
+                continue
+            cols, vals = w.indices[start:end], w.data[start:end]
+            if len(vals) > k:
+                keep = np.argpartition(-vals, k - 1)[:k]
+                # bring in everything tied with the k-th value so the id tie-break is stable
+                kth = vals[keep].min()
+                keep = np.flatnonzero(vals >= kth)
+                cols, vals = cols[keep], vals[keep]
+            order = np.lexsort((self.employee_ids[cols], -vals))[:k]
+            out[int(eid)] = [(int(self.employee_ids[cols[j]]), int(vals[j])) for j in order]
+        return out
+
+    def team_collaborators(self, team: Iterable[Any], k: int = TOP_K_DEFAULT) -> List[Tuple[int, int]]:
+        """People outside the team ranked by projects shared with any team member (summed)."""
+        rows = [self._code[int(e)] for e in team if int(e) in self._code]
+        if not rows:
+            return []
+        totals = np.asarray(self.weights[rows].sum(axis=0)).ravel()
+        totals[rows] = 0
+        cand = np.flatnonzero(totals)
+        order = np.lexsort((self.employee_ids[cand], -totals[cand]))[:k]
+        return [(int(self.employee_ids[cand[j]]), int(totals[cand[j]])) for j in order]
+
+
+def collaborator_rows(top: Dict[int, List[Tuple[int, int]]]) -> List[Dict[str, Any]]:
+    return [{"EmployeeID": eid, "Rank": rank, "CollaboratorID": cid, "SharedProjects": n}
+            for eid in sorted(top) for rank, (cid, n) in enumerate(top[eid], start=1)]
+
+
+def build_collaborators(outdir: Path, k: int = TOP_K_DEFAULT, links: List[Dict[str, Any]] = None) -> int:
+    """Write collaborators.csv for outdir (from project_employees.csv unless links are given)."""
+    outdir = Path(outdir)
+    if links is None:
+        _, links = read_csv(outdir / "project_employees.csv")
+    rows = collaborator_rows(CoworkerGraph(links).top_k(k))
+    write_csv(outdir / COLLABORATORS_FILE, rows, COLLABORATORS_HEADER)
+    return len(rows)
+
+
+def load_collaborators(outdir: Path) -> Dict[int, List[Tuple[int, int]]]:
+    _, rows = read_csv(Path(outdir) / COLLABORATORS_FILE)
+    out: Dict[int, List[Tuple[int, int]]] = {}
+    for r in rows:
+        out.setdefault(int(r["EmployeeID"]), []).append((int(r["CollaboratorID"]), int(r["SharedProjects"])))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top collaborators per employee from the project-employee bridge")
+    parser.add_argument("outdir", nargs="?", default=".", help="Directory with project_employees.csv")
+    parser.add_argument("--top", type=int, default=TOP_K_DEFAULT,
+                        help=f"Collaborators kept per employee (default: {TOP_K_DEFAULT})")
+    parser.add_argument("--employee", type=int, default=None,
+                        help="Print the stored top collaborators of this EmployeeID")
+    parser.add_argument("--team", type=str, default=None,
+                        help="Comma-separated EmployeeIDs; print who shares the most projects with them")
+    args = parser.parse_args()
+
+    outdir = Path(args.outdir)
+    if args.employee is not None:
+        for cid, n in load_collaborators(outdir).get(args.employee, []):
+            print(f"{cid:>8}  {n} shared project(s)")
+        return
+    if args.team:
+        _, links = read_csv(outdir / "project_employees.csv")
+        team = [int(x) for x in args.team.split(",") if x.strip()]
+        for cid, n in CoworkerGraph(links).team_collaborators(team, args.top):
+            print(f"{cid:>8}  {n} shared project(s)")
+        return
+    n = build_collaborators(outdir, args.top)
+    print(f"Wrote {n} collaborator rows to {outdir / COLLABORATORS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
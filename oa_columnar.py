@@ -0,0 +1,167 @@
+"""
+Columnar in-memory store for the exported tables.
+
+A list of dicts keeps one dict per row and one string object per cell, so
+values such as studio_office, practice_area, region, title or status are
+repeated thousands of times. ColumnarTable keeps one column per header
+instead:
+
+  * CategoricalColumn - small integer codes into a table of interned values
+    (forced for CATEGORICAL_COLUMNS, chosen automatically for any column
+    with at most half as many distinct values as rows),
+  * NumericColumn     - a float64 array; cells whose text does not round-trip
+    ('$1,250,000.00', 'N/A') keep their original string on the side,
+  * StringColumn      - interned strings for free text.
+
+table[i] returns a RowView, a read-only Mapping with the same keys and
+string values as the csv.DictReader row it replaces. Filters can compare
+codes instead of strings:
+
+    mask = employees.equals("studio_office", "Chicago Studio 01") & employees.isin("status", ["Active"])
+"""
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+CATEGORICAL_COLUMNS = {"studio_office", "office", "practice_area", "sub_practice_area", "sub_practice_areas",
+                       "region", "title", "job_title", "status", "service_type", "studio", "client",
+                       "field.studio", "field.practice_area", "field.built_unbuilt"}
+
+
+def _code_dtype(n: int):
+    return np.uint8 if n <= 0xFF else np.uint16 if n <= 0xFFFF else np.int32
+
+
+class CategoricalColumn:
+    def __init__(self, values: Sequence[str]):
+        lookup: Dict[str, int] = {"": 0}
+        self.values: List[str] = [""]
+        codes = np.empty(len(values), dtype=np.int64)
+        for i, v in enumerate(values):
+            c = lookup.get(v)
+            if c is None:
+                c = lookup[v] = len(self.values)
+                self.values.append(sys.intern(v))
+            codes[i] = c
+        self.codes = codes.astype(_code_dtype(len(self.values)))
+        self._lookup = lookup
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[self.codes[i]]
+
+    def code(self, value: str) -> Optional[int]:
+        return self._lookup.get(value)
+
+    def equals(self, value: str) -> np.ndarray:
+        c = self.code(value)
+        return self.codes == c if c is not None else np.zeros(len(self.codes), dtype=bool)
+
+    def isin(self, values: Iterable[str]) -> np.ndarray:
+        codes = [c for c in (self.code(v) for v in values) if c is not None]
+        return np.isin(self.codes, codes)
+
+
+def _format_number(f: float) -> str:
+    return str(int(f)) if f.is_integer() and abs(f) < 1e16 else repr(f)
+
+
+class NumericColumn:
+    def __init__(self, values: Sequence[str], parse: Callable[[Any], float]):
+        self.values = np.empty(len(values), dtype=np.float64)
+        self.raw: Dict[int, str] = {}  # cells whose text is not the canonical form of their number
+        for i, v in enumerate(values):
+            f = parse(v)
+            self.values[i] = f
+            canonical = "" if np.isnan(f) else _format_number(f)
+            if v != canonical:
+                self.raw[i] = sys.intern(v)
+
+    def __getitem__(self, i: int) -> str:
+        raw = self.raw.get(i)
+        if raw is not None:
+            return raw
+        f = float(self.values[i])
+        return "" if np.isnan(f) else _format_number(f)
+
+
+class StringColumn:
+    def __init__(self, values: Sequence[str]):
+        self.values = [sys.intern(v) for v in values]
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[i]
+
+
+class RowView(Mapping):
+    """Read-only dict-like view of one row of a ColumnarTable."""
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "ColumnarTable", i: int):
+        self._table = table
+        self._i = i
+
+    def __getitem__(self, key: str) -> str:
+        return self._table.columns[key][self._i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.header)
+
+    def __len__(self) -> int:
+        return len(self._table.header)
+
+    def __repr__(self) -> str:
+        return f"RowView({dict(self)!r})"
+
+
+class ColumnarTable:
+    def __init__(self, header: List[str], rows: Sequence[Sequence[str]],
+                 numeric: Optional[Dict[str, Callable[[Any], float]]] = None,
+                 categorical: Iterable[str] = CATEGORICAL_COLUMNS):
+        numeric = numeric or {}
+        categorical = set(categorical)
+        self.header = list(header)
+        self._len = len(rows)
+        self.columns: Dict[str, Any] = {}
+        width = len(self.header)
+        for j, name in enumerate(self.header):
+            values = [(r[j] if j < len(r) else "") or "" for r in rows] if width else []
+            if name in numeric:
+                self.columns[name] = NumericColumn(values, numeric[name])
+            elif name in categorical or len(set(values)) * 2 <= len(values):
+                self.columns[name] = CategoricalColumn(values)
+            else:
+                self.columns[name] = StringColumn(values)
+
+    @classmethod
+    def from_dicts(cls, rows: List[Dict[str, Any]], header: Optional[List[str]] = None, **kwargs) -> "ColumnarTable":
+        header = header or (list(rows[0].keys()) if rows else [])
+        return cls(header, [["" if r.get(h) is None else str(r.get(h)) for h in header] for r in rows], **kwargs)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i: int) -> RowView:
+        if not -self._len <= i < self._len:
+            raise IndexError(i)
+        return RowView(self, i % self._len if self._len else i)
+
+    def __iter__(self) -> Iterator[RowView]:
+        return (RowView(self, i) for i in range(self._len))
+
+    def column(self, name: str):
+        return self.columns[name]
+
+    def equals(self, name: str, value: str) -> np.ndarray:
+        col = self.columns[name]
+        if isinstance(col, CategoricalColumn):
+            return col.equals(value)
+        return np.fromiter((col[i] == value for i in range(self._len)), dtype=bool, count=self._len)
+
+    def isin(self, name: str, values: Iterable[str]) -> np.ndarray:
+        col = self.columns[name]
+        if isinstance(col, CategoricalColumn):
+            return col.isin(values)
+        wanted = set(values)
+        return np.fromiter((col[i] in wanted for i in range(self._len)), dtype=bool, count=self._len)
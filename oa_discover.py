@@ -4,6 +4,11 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from openasset_export import (
+    PROJECT_FIELDS_VARIANTS, FIELDS_CATALOG_VARIANTS, PROFILE_PATH_DEFAULT,
+    PROFILE, remember_variant, resolve_variant, useful_field_rows, catalog_from, save_profile,
+)
+
 BASE_URL = "https://perkinseastman.openasset.com/REST/1"
 TIMEOUT = (5, 30)
 RETRY_CFG = dict(total=4, backoff_factor=0.5,
@@ -78,5 +83,25 @@ def main():
     for row in summary:
         print(f"{row['endpoint']:<35}  status={row['status']}  count={row['items_or_keys']}")
 
+    # 2) Capability profile: first working variant per endpoint family, for openasset_export.py
+    print("\n=== Capability profile ===")
+    families = [
+        ("project_fields", PROJECT_FIELDS_VARIANTS, useful_field_rows),
+        ("fields_catalog", FIELDS_CATALOG_VARIANTS, catalog_from),
+    ]
+    for family, variants, accept in families:
+        for label_, endpoint, params in variants:
+            url, params = resolve_variant(endpoint, params, pid=pid)
+            _, st, dat = try_get(s, url, params=params, label=label_)
+            ok = st == 200 and bool(accept(dat))
+            print(f"{family:<16} {label_:<40} status={st}  {'OK' if ok else '-'}")
+            if ok:
+                remember_variant(family, label_)
+                break
+        else:
+            PROFILE.pop(family, None)
+    p = save_profile(Path(PROFILE_PATH_DEFAULT), force=True)
+    print(f"Profile written to {p.resolve()}")
+
 if __name__ == "__main__":
     main()
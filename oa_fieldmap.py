@@ -0,0 +1,88 @@
+"""
+Friendly project columns (practice_area, region, ...) from `field.*` keys.
+
+Aliases live in field_aliases.json ({target: [alias, ...]}). A field maps to
+a target when an alias occurs in its normalized name ("field.Sub_Practice_Area"
+-> "sub practice area"); an exact match beats a substring match, otherwise the
+first field in record order wins. All aliases are compiled into one regex and
+each distinct field name is resolved once, so mapping a record costs one dict
+lookup per key.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ALIASES_PATH_DEFAULT = Path(__file__).resolve().parent / "field_aliases.json"
+FIELD_PREFIX = "field."
+
+EXACT, PARTIAL = 0, 1
+
+
+def normalize_name(name: str) -> str:
+    return name.replace("_", " ").lower().strip()
+
+
+class FieldMapper:
+    def __init__(self, aliases: Dict[str, List[str]]):
+        self.targets: List[str] = list(aliases)
+        self.aliases: Dict[str, set] = {t: {normalize_name(a) for a in al} for t, al in aliases.items()}
+        # One optional lookahead per target: a single match() reports every
+        # target whose aliases occur anywhere in the name.
+        groups = []
+        for i, t in enumerate(self.targets):
+            alts = "|".join(re.escape(a) for a in sorted(self.aliases[t], key=len, reverse=True))
+            groups.append(f"(?:(?=.*?(?P<t{i}>{alts})))?" if alts else "")
+        self._matcher = re.compile("^" + "".join(groups))
+        self._resolved: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+
+    @classmethod
+    def from_file(cls, path: Path) -> "FieldMapper":
+        with Path(path).open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected an object of target -> [aliases]")
+        return cls({str(t): [str(a) for a in (al or [])] for t, al in data.items()})
+
+    def resolve(self, key: str) -> Tuple[Tuple[str, int], ...]:
+        """(target, rank) pairs a record key maps to; memoized per distinct key."""
+        hit = self._resolved.get(key)
+        if hit is not None:
+            return hit
+        out: Tuple[Tuple[str, int], ...] = ()
+        if key.startswith(FIELD_PREFIX):
+            base = normalize_name(key[len(FIELD_PREFIX):])
+            m = self._matcher.match(base)
+            out = tuple(
+                (t, EXACT if base in self.aliases[t] else PARTIAL)
+                for i, t in enumerate(self.targets) if m.group(f"t{i}") is not None
+            )
+        self._resolved[key] = out
+        return out
+
+    def extract(self, src: Dict[str, Any]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {t: "" for t in self.targets}
+        rank: Dict[str, int] = {}
+        resolve = self._resolved.get
+        for k, v in src.items():
+            hits = resolve(k)
+            if hits is None:
+                hits = self.resolve(k)
+            if not hits or not v:
+                continue
+            for t, r in hits:
+                if r < rank.get(t, PARTIAL + 1):
+                    out[t] = v
+                    rank[t] = r
+        return out
+
+
+_default: Optional[FieldMapper] = None
+
+
+def field_mapper(path: Optional[Path] = None) -> FieldMapper:
+    """The process-wide mapper; loads field_aliases.json on first use or when a path is given."""
+    global _default
+    if path is not None or _default is None:
+        _default = FieldMapper.from_file(path or ALIASES_PATH_DEFAULT)
+    return _default
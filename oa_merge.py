@@ -0,0 +1,119 @@
+"""
+Merge shard outputs of `openasset_export.py --shard i/N` into the canonical CSVs.
+
+    python oa_merge.py --outdir Data shard0 shard1 shard2 shard3
+
+Projects are disjoint across shards; employees show up in every shard that
+links them and are deduplicated by EmployeeID (newest `updated` wins); bridge
+rows are deduplicated by (ProjectID, EmployeeID). Role codes are shard-local,
+so RoleIDs are re-encoded against one merged project_roles.csv, seeded from
+the project_roles.csv already in --outdir so codes stay stable between
+merges. Headers are unified in first-seen order.
+"""
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from openasset_export import (
+    BRIDGE_HEADER, PROJECT_FRONT_COLUMNS, ROLES_FILE,
+    front_columns, load_role_codes, read_csv, role_code, role_rows, write_csv,
+)
+
+FILES = ("projects.csv", "employees.csv", "project_employees.csv")
+
+
+def _id_key(v: Any) -> Tuple[int, Any]:
+    # numeric ids sort numerically, anything else after them as text
+    try:
+        return 0, int(v)
+    except (TypeError, ValueError):
+        return 1, str(v)
+
+
+def _union_headers(headers: List[List[str]]) -> List[str]:
+    out: List[str] = []
+    have = set()
+    for h in headers:
+        for c in h:
+            if c not in have:
+                have.add(c)
+                out.append(c)
+    return out
+
+
+def merge_shards(shard_dirs: List[Path], outdir: Path) -> Dict[str, int]:
+    projects: Dict[str, Dict[str, str]] = {}
+    employees: Dict[str, Dict[str, str]] = {}
+    bridge: Dict[Tuple[str, str], Dict[str, str]] = {}
+    role_codes = load_role_codes(outdir / ROLES_FILE)
+    headers: Dict[str, List[List[str]]] = {name: [] for name in FILES}
+
+    for d in shard_dirs:
+        missing = [name for name in FILES if not (d / name).exists()]
+        if missing:
+            raise SystemExit(f"Shard {d} is incomplete (missing {', '.join(missing)})")
+
+        header, rows = read_csv(d / "projects.csv")
+        headers["projects.csv"].append(header)
+        for r in rows:
+            pid = r.get("id", "")
+            if pid in projects:
+                print(f"  ⚠️  Project {pid} appears in more than one shard; keeping the first")
+                continue
+            projects[pid] = r
+
+        header, rows = read_csv(d / "employees.csv")
+        headers["employees.csv"].append(header)
+        for r in rows:
+            eid = r.get("EmployeeID") or r.get("id", "")
+            prev = employees.get(eid)
+            if prev is None or (r.get("updated") or "") > (prev.get("updated") or ""):
+                employees[eid] = r
+
+        local_roles: Dict[str, str] = {}
+        if (d / ROLES_FILE).exists():
+            local_roles = {r["RoleID"]: r["Role"] for r in read_csv(d / ROLES_FILE)[1]}
+
+        header, rows = read_csv(d / "project_employees.csv")
+        headers["project_employees.csv"].append(header)
+        for r in rows:
+            if r.get("RoleIDs"):
+                codes = r["RoleIDs"].split("; ")
+                unknown = [c for c in codes if c not in local_roles]
+                if unknown:
+                    if not (d / ROLES_FILE).exists():
+                        raise SystemExit(f"Shard {d} is incomplete (missing {ROLES_FILE})")
+                    raise SystemExit(f"Shard {d}: RoleIDs {', '.join(unknown)} not in {ROLES_FILE}")
+                r["RoleIDs"] = "; ".join(str(role_code(role_codes, local_roles[c])) for c in codes)
+            bridge.setdefault((r["ProjectID"], r["EmployeeID"]), r)
+
+    proj_header = front_columns(_union_headers(headers["projects.csv"]), PROJECT_FRONT_COLUMNS)
+    emp_header = front_columns(_union_headers(headers["employees.csv"]), ["EmployeeID"])
+    bridge_header = front_columns(_union_headers(headers["project_employees.csv"]), BRIDGE_HEADER)
+
+    outdir.mkdir(parents=True, exist_ok=True)
+    write_csv(outdir / "projects.csv", [projects[k] for k in sorted(projects, key=_id_key)], proj_header)
+    write_csv(outdir / "employees.csv", [employees[k] for k in sorted(employees, key=_id_key)], emp_header)
+    write_csv(outdir / "project_employees.csv",
+              [bridge[k] for k in sorted(bridge, key=lambda k: (_id_key(k[0]), _id_key(k[1])))],
+              bridge_header)
+    write_csv(outdir / ROLES_FILE, role_rows(role_codes), ["RoleID", "Role"])
+    return {"projects": len(projects), "employees": len(employees), "links": len(bridge), "roles": len(role_codes)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge sharded openasset_export.py outputs")
+    parser.add_argument("shards", nargs="+", help="Shard output directories")
+    parser.add_argument("--outdir", type=str, default=".",
+                        help="Directory for the merged CSVs")
+    args = parser.parse_args()
+
+    outdir = Path(args.outdir)
+    shard_dirs = [Path(s) for s in args.shards]
+    print(f"Merging {len(shard_dirs)} shard(s) into {outdir.resolve()}...")
+    counts = merge_shards(shard_dirs, outdir)
+    print(f"Done: {counts['projects']} projects, {counts['employees']} employees, {counts['links']} links, {counts['roles']} roles.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Publish export outputs: pre-compressed variants plus a content-hashed manifest.
+
+For every output file we write <name>.gz and <name>.br next to it (brotli is
+in requirements.txt; without it only .gz is written, with a warning), and a
+manifest.json with the encodings written plus the sha256, size and (for CSVs)
+row count of each file and its variants.
+Consumers compare the sha256 with what they already have and only download
+(compressed) files that changed. Files whose hash matches the existing manifest are not recompressed.
+
+    python oa_publish.py Data
+"""
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+PUBLISH_FILES = ["employees.csv", "projects.csv", "project_employees.csv", "project_roles.csv",
+                 "collaborators.csv", "employee_experience.csv", "search_index.bin"]
+
+
+def _compressors() -> Dict[str, Any]:
+    out = {"gzip": (".gz", lambda b: gzip.compress(b, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        out["br"] = (".br", lambda b: brotli.compress(b, quality=11))
+    return out
+
+
+def count_rows(raw: bytes) -> int:
+    # csv-aware, so quoted multi-line cells count as one row
+    return max(sum(1 for _ in csv.reader(io.StringIO(raw.decode("utf-8-sig"), newline=""))) - 1, 0)
+
+
+def _write_atomically(path: Path, data: bytes) -> None:
+    # same temp-file-and-rename as openasset_export.write_csv: readers see the old
+    # file or the new one, never a truncated one
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load_manifest(outdir: Path) -> Dict[str, Any]:
+    path = outdir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish_outputs(outdir: Path, names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Compress each existing file in outdir and (re)write manifest.json; returns the manifest."""
+    outdir = Path(outdir)
+    previous = load_manifest(outdir).get("files", {})
+    compressors = _compressors()
+    files: Dict[str, Any] = {}
+    for name in names or PUBLISH_FILES:
+        src = outdir / name
+        if not src.exists():
+            continue
+        raw = src.read_bytes()
+        sha = hashlib.sha256(raw).hexdigest()
+        prev = previous.get(name) or {}
+        entry: Dict[str, Any] = {"sha256": sha, "bytes": len(raw), "rows": None, "variants": {}}
+        reuse = prev.get("sha256") == sha
+        if name.endswith(".csv"):
+            entry["rows"] = prev["rows"] if reuse and prev.get("rows") is not None else count_rows(raw)
+        for enc, (suffix, compress) in compressors.items():
+            dst = outdir / (name + suffix)
+            pv = (prev.get("variants") or {}).get(enc)
+            if reuse and pv and dst.exists() and dst.stat().st_size == pv.get("bytes"):
+                entry["variants"][enc] = pv
+                continue
+            data = compress(raw)
+            _write_atomically(dst, data)
+            entry["variants"][enc] = {
+                "path": dst.name, "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest(),
+            }
+        files[name] = entry
+
+    # written last, so it only ever points at variants that are already in place
+    manifest = {"generated": time.strftime("%Y-%m-%dT%H:%M:%S"), "encodings": sorted(compressors), "files": files}
+    _write_atomically(outdir / MANIFEST_NAME,
+                      json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write compressed variants and a content-hashed manifest")
+    parser.add_argument("outdir", nargs="?", default=".", help="Directory with the exported CSVs")
+    args = parser.parse_args()
+
+    outdir = Path(args.outdir)
+    if brotli is None:
+        print("brotli not installed; writing gzip variants only (pip install brotli)")
+    manifest = publish_outputs(outdir)
+    for name, e in manifest["files"].items():
+        sizes = ", ".join(f"{enc} {v['bytes']:,}" for enc, v in e["variants"].items())
+        rows = "" if e["rows"] is None else e["rows"]
+        print(f"{name:<24} {rows:>6} rows  {e['bytes']:>10,} B  ({sizes})  {e['sha256'][:12]}")
+    print(f"Manifest: {outdir / MANIFEST_NAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Background refresh: run the export on an interval and publish atomically.
+
+Each run exports into a staging directory under <root>/versions/, validates
+it (row counts plus the required columns check_csv_fields.py looks for) and
+only then publishes it: the staging dir is renamed to its final version name
+and <root>/current is flipped to it with an atomic rename. Readers pointed at
+<root>/current always see one complete snapshot. The newest --keep versions
+are retained for instant rollback; a version that was rolled back from is
+recorded in <root>/ROLLED_BACK and pruned before any other. A failed run
+(export error, validation failure or exception) never stops the loop and
+leaves published versions untouched.
+
+    python oa_refresh.py --root snapshots --interval 3600 -- --test 0 --publish
+    python oa_refresh.py --root snapshots --list
+    python oa_refresh.py --root snapshots --rollback            # previous version
+    python oa_refresh.py --root snapshots --rollback 20261019-0930
+
+Arguments after "--" go to openasset_export.py. Where symlinks are not
+available (e.g. Windows without developer mode) <root>/CURRENT holds the
+version name instead; current_dir() resolves either form.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from openasset_export import read_csv
+
+EXPORTER = Path(__file__).resolve().parent / "openasset_export.py"
+KEEP_DEFAULT = 5
+MAX_DROP_DEFAULT = 0.2
+STAGING_SUFFIX = ".staging"
+FAILED_SUFFIX = ".failed" + STAGING_SUFFIX
+ROLLED_BACK_FILE = "ROLLED_BACK"
+REQUIRED_COLUMNS: Dict[str, List[str]] = {
+    "employees.csv": [
+        "id", "EmployeeID", "last_name", "title", "job_title", "email", "work_phone",
+        "studio_office", "total_years_in_industry", "current_years_with_this_firm", "status",
+    ],
+    "projects.csv": ["id", "name"],
+    "project_employees.csv": ["ProjectID", "EmployeeID"],
+}
+
+
+# ========= versions =========
+def versions_dir(root: Path) -> Path:
+    return root / "versions"
+
+
+def list_versions(root: Path) -> List[str]:
+    vdir = versions_dir(root)
+    if not vdir.exists():
+        return []
+    return sorted(p.name for p in vdir.iterdir() if p.is_dir() and not p.name.endswith(STAGING_SUFFIX))
+
+
+def current_version(root: Path) -> Optional[str]:
+    link = root / "current"
+    if link.is_symlink():
+        return Path(os.readlink(link)).name
+    pointer = root / "CURRENT"
+    if pointer.exists():
+        return pointer.read_text(encoding="utf-8").strip() or None
+    return None
+
+
+def current_dir(root: Path) -> Optional[Path]:
+    v = current_version(root)
+    return versions_dir(root) / v if v else None
+
+
+def _replace_atomically(path: Path, write) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.is_symlink() or tmp.exists():
+        tmp.unlink()
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def flip_current(root: Path, version: str) -> None:
+    """Point <root>/current (symlink) and <root>/CURRENT (pointer file) at version."""
+    target = Path("versions") / version
+    try:
+        _replace_atomically(root / "current", lambda tmp: os.symlink(target, tmp, target_is_directory=True))
+    except OSError as ex:
+        print(f"  ⚠️  Could not flip symlink ({ex}); using CURRENT pointer file only")
+    _replace_atomically(root / "CURRENT", lambda tmp: tmp.write_text(version + "\n", encoding="utf-8"))
+
+
+def rolled_back(root: Path) -> List[str]:
+    """Versions that were current when a rollback moved away from them."""
+    path = root / ROLLED_BACK_FILE
+    if not path.exists():
+        return []
+    return [v for v in path.read_text(encoding="utf-8").split() if v]
+
+
+def _save_rolled_back(root: Path, versions: List[str]) -> None:
+    text = "".join(v + "\n" for v in versions)
+    _replace_atomically(root / ROLLED_BACK_FILE, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+
+
+def prune(root: Path, keep: int, protect: Iterable[Optional[str]] = ()) -> List[str]:
+    """
+    Delete old versions so at most `keep` remain. The current version and
+    `protect` (e.g. the version that was current before this refresh) are never
+    deleted; rolled-back-from versions go first, then the oldest.
+    """
+    cur = current_version(root)
+    versions = list_versions(root)
+    kept = {v for v in protect if v and v != cur and v in versions}
+    rejected = set(rolled_back(root))
+    old = [v for v in versions if v != cur and v not in kept]
+    old.sort(key=lambda v: (v not in rejected, v))
+    doomed = old[: max(len(old) - max(keep - 1 - len(kept), 0), 0)]
+    for v in doomed:
+        shutil.rmtree(versions_dir(root) / v, ignore_errors=True)
+    if rejected & set(doomed):
+        _save_rolled_back(root, [v for v in rolled_back(root) if v not in doomed])
+    return doomed
+
+
+# ========= validation =========
+def validate(staging: Path, previous: Optional[Path], max_drop: float) -> List[str]:
+    """Problems that should block publishing; empty when the snapshot looks sane."""
+    problems = []
+    for fname, required in REQUIRED_COLUMNS.items():
+        path = staging / fname
+        if not path.exists():
+            problems.append(f"{fname}: missing")
+            continue
+        header, rows = read_csv(path)
+        missing = [c for c in required if c not in header]
+        if missing:
+            problems.append(f"{fname}: missing columns {', '.join(missing)}")
+        if not rows:
+            problems.append(f"{fname}: no rows")
+        elif previous and (previous / fname).exists():
+            before = len(read_csv(previous / fname)[1])
+            if before and len(rows) < before * (1 - max_drop):
+                problems.append(f"{fname}: {len(rows)} rows, down from {before} (> {max_drop:.0%} drop)")
+    return problems
+
+
+# ========= one refresh =========
+def _new_version(root: Path) -> str:
+    version = time.strftime("%Y%m%d-%H%M%S")
+    n = 1
+    while (versions_dir(root) / version).exists():  # two runs within the same second
+        n += 1
+        version = time.strftime("%Y%m%d-%H%M%S") + f"-{n}"
+    return version
+
+
+def _keep_failed(staging: Path) -> None:
+    """Move a failed staging dir aside for inspection (cleared by the next run)."""
+    if not staging.exists():
+        return
+    failed = staging.with_name(staging.name[: -len(STAGING_SUFFIX)] + FAILED_SUFFIX)
+    shutil.rmtree(failed, ignore_errors=True)
+    os.replace(staging, failed)
+
+
+def refresh_once(root: Path, export_args: List[str], keep: int, max_drop: float) -> bool:
+    """One export + validate + publish; any exception is logged and reported as a failed run."""
+    version = _new_version(root)
+    staging = versions_dir(root) / (version + STAGING_SUFFIX)
+    try:
+        return _refresh(root, version, staging, export_args, keep, max_drop)
+    except Exception:
+        print(f"[{version}] ⚠️  Refresh crashed; keeping {current_version(root) or 'nothing'} published:")
+        traceback.print_exc()
+        try:
+            _keep_failed(staging)
+        except OSError as ex:
+            print(f"[{version}] ⚠️  Could not move {staging} aside: {ex}")
+        return False
+
+
+def _refresh(root: Path, version: str, staging: Path, export_args: List[str], keep: int, max_drop: float) -> bool:
+    for stale in versions_dir(root).glob("*" + STAGING_SUFFIX):
+        shutil.rmtree(stale, ignore_errors=True)
+    staging.mkdir(parents=True, exist_ok=True)
+    previous = current_dir(root)
+
+    cmd = [sys.executable, str(EXPORTER), "--outdir", str(staging)]
+    if previous and "--changes-from" not in export_args:
+        cmd += ["--changes-from", str(previous)]
+    cmd += export_args
+    print(f"[{version}] Exporting into {staging}...")
+    if subprocess.run(cmd).returncode != 0:
+        print(f"[{version}] ⚠️  Export failed; keeping {current_version(root) or 'nothing'} published")
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+
+    problems = validate(staging, previous, max_drop)
+    if problems:
+        print(f"[{version}] ⚠️  Validation failed; keeping {current_version(root) or 'nothing'} published:")
+        for p in problems:
+            print(f"    - {p}")
+        _keep_failed(staging)
+        return False
+
+    final = versions_dir(root) / version
+    os.replace(staging, final)
+    flip_current(root, version)
+    removed = prune(root, keep, protect=[previous.name if previous else None])
+    print(f"[{version}] Published {final}" + (f" (pruned {', '.join(removed)})" if removed else ""))
+    return True
+
+
+def rollback(root: Path, version: Optional[str]) -> str:
+    versions = list_versions(root)
+    cur = current_version(root)
+    if version is None:
+        older = [v for v in versions if cur is None or v < cur]
+        if not older:
+            raise SystemExit("No older version to roll back to.")
+        version = older[-1]
+    if version not in versions:
+        raise SystemExit(f"Unknown version {version!r}; have: {', '.join(versions) or 'none'}")
+    flip_current(root, version)
+    rejected = [v for v in rolled_back(root) if v != version]
+    if cur and cur != version and cur not in rejected:
+        rejected.append(cur)
+    _save_rolled_back(root, rejected)
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduled export with validated, atomic snapshot publishing")
+    parser.add_argument("--root", type=str, default="snapshots",
+                        help="Directory holding versions/ and the current pointer (default: snapshots)")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between runs; 0 = run once and exit (default: 0)")
+    parser.add_argument("--keep", type=int, default=KEEP_DEFAULT,
+                        help=f"Published versions to keep for rollback (default: {KEEP_DEFAULT})")
+    parser.add_argument("--max-drop", type=float, default=MAX_DROP_DEFAULT,
+                        help=f"Reject a snapshot whose row count falls by more than this fraction "
+                             f"(default: {MAX_DROP_DEFAULT})")
+    parser.add_argument("--list", action="store_true", help="List versions and exit")
+    parser.add_argument("--rollback", nargs="?", const="", default=None, metavar="VERSION",
+                        help="Point current at VERSION (default: the one before current) and exit")
+    parser.add_argument("export_args", nargs=argparse.REMAINDER,
+                        help="Arguments for openasset_export.py, after --")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if args.list:
+        cur = current_version(root)
+        rejected = set(rolled_back(root))
+        for v in list_versions(root):
+            print(f"{'*' if v == cur else ' '} {v}" + ("  (rolled back)" if v in rejected else ""))
+        return
+    if args.rollback is not None:
+        v = rollback(root, args.rollback or None)
+        print(f"current -> {v}")
+        return
+
+    export_args = args.export_args[1:] if args.export_args[:1] == ["--"] else args.export_args
+    while True:
+        refresh_once(root, export_args, args.keep, args.max_drop)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+BM25 full-text search over project text fields, built at export time.
+
+Indexed fields: the project description variants, awards, client, name and
+address (SEARCH_FIELDS). Text is lower-cased, split on non-alphanumerics,
+stop words dropped and suffixes stripped with a light Porter-style stemmer.
+
+On-disk format (search_index.bin, little-endian):
+
+    magic "OABM1"  u32 header_len  header JSON (utf-8)  postings bytes
+
+The header holds the project ids, document lengths and, per term, the byte
+offset and document frequency of its postings list. A postings list is a
+run of (doc gap, term frequency) varint pairs, sorted by doc number.
+
+    python oa_search.py Data --build
+    python oa_search.py Data "historic office renovation Chicago"
+"""
+import argparse
+import json
+import math
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from openasset_export import read_csv
+
+INDEX_FILE = "search_index.bin"
+MAGIC = b"OABM1"
+K1, B = 1.2, 0.75
+SEARCH_FIELDS = [
+    "name",
+    "field.project_description__project_page",
+    "field.project_description__website",
+    "field.project_description__resume",
+    "field.project_description__sustainability",
+    "field.project_description__interior",
+    "field.project_description__programming",
+    "field.awards",
+    "field.client",
+    "field.secondary_client",
+    "field.address",
+    "field.sustainability_details",
+]
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or our that the their this "
+    "to was were which with within".split()
+)
+_SUFFIXES = [
+    "izations", "ization", "ations", "ation", "ements", "ement", "ments", "ment", "ness",
+    "ings", "ing", "ated", "ates", "ate", "edly", "ies", "ied", "ers", "ed", "er", "ly", "es", "s",
+]
+
+
+def stem(word: str) -> str:
+    """Strip the first matching suffix (keeping at least three letters) and a trailing 'e',
+    so renovate / renovated / renovation / renovations all become 'renov'."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith(("ss", "us", "is")):
+                break
+            word = word[: -len(suffix)] + ("y" if suffix in ("ies", "ied") else "")
+            break
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(t) for t in _TOKEN.findall((text or "").lower()) if t not in STOP_WORDS]
+
+
+# ========= varint postings =========
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varints(buf: bytes, pos: int, count: int) -> Tuple[List[int], int]:
+    vals = []
+    for _ in range(count):
+        n = shift = 0
+        while True:
+            b = buf[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        vals.append(n)
+    return vals, pos
+
+
+# ========= index =========
+def build_index(projects: Iterable[Dict[str, Any]], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    fields = fields or SEARCH_FIELDS
+    ids: List[str] = []
+    lengths: List[int] = []
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    for doc, p in enumerate(projects):
+        ids.append(str(p.get("id", "")))
+        tf: Dict[str, int] = {}
+        n = 0
+        for f in fields:
+            for tok in tokenize(str(p.get(f) or "")):
+                tf[tok] = tf.get(tok, 0) + 1
+                n += 1
+        lengths.append(n)
+        for tok, c in tf.items():
+            postings.setdefault(tok, []).append((doc, c))
+    return {"ids": ids, "lengths": lengths, "postings": postings, "fields": fields}
+
+
+def write_index(path: Path, index: Dict[str, Any]) -> int:
+    body = bytearray()
+    terms: Dict[str, List[int]] = {}
+    for term in sorted(index["postings"]):
+        plist = index["postings"][term]
+        terms[term] = [len(body), len(plist)]
+        prev = 0
+        for doc, tf in plist:
+            _put_varint(body, doc - prev)
+            _put_varint(body, tf)
+            prev = doc
+    header = json.dumps(
+        {"ids": index["ids"], "lengths": index["lengths"], "fields": index["fields"], "terms": terms},
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # renamed into place like write_csv, so a running SearchIndex reader never sees a truncated file
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(body)
+    os.replace(tmp, path)
+    return len(MAGIC) + 4 + len(header) + len(body)
+
+
+class SearchIndex:
+    def __init__(self, path: Path):
+        raw = Path(path).read_bytes()
+        if raw[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a search index")
+        (hlen,) = struct.unpack_from("<I", raw, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(raw[start:start + hlen].decode("utf-8"))
+        self._postings = raw[start + hlen:]
+        self.ids: List[str] = header["ids"]
+        self.lengths: List[int] = header["lengths"]
+        self.terms: Dict[str, List[int]] = header["terms"]
+        self.avg_len = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def postings(self, term: str) -> List[Tuple[int, int]]:
+        entry = self.terms.get(term)
+        if not entry:
+            return []
+        offset, df = entry
+        vals, _ = _read_varints(self._postings, offset, 2 * df)
+        out, doc = [], 0
+        for gap, tf in zip(vals[0::2], vals[1::2]):
+            doc += gap
+            out.append((doc, tf))
+        return out
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (project id, BM25 score)."""
+        n_docs = len(self.ids)
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            plist = self.postings(term)
+            if not plist:
+                continue
+            idf = math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            for doc, tf in plist:
+                norm = K1 * (1 - B + B * self.lengths[doc] / (self.avg_len or 1))
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+        return [(self.ids[doc], score) for doc, score in ranked]
+
+
+def build_search_index(outdir: Path, projects: Optional[List[Dict[str, Any]]] = None) -> int:
+    """Write search_index.bin for outdir (from projects.csv unless rows are given); returns its size."""
+    outdir = Path(outdir)
+    if projects is None:
+        _, projects = read_csv(outdir / "projects.csv")
+    return write_index(outdir / INDEX_FILE, build_index(projects))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 search over exported project text")
+    parser.add_argument("outdir", help="Directory with projects.csv / search_index.bin")
+    parser.add_argument("query", nargs="?", default=None, help="Search terms")
+    parser.add_argument("--build", action="store_true", help="(Re)build search_index.bin from projects.csv")
+    parser.add_argument("--top", type=int, default=10, help="Number of results (default: 10)")
+    args = parser.parse_intermixed_args()
+
+    outdir = Path(args.outdir)
+    if args.build:
+        size = build_search_index(outdir)
+        print(f"Wrote {outdir / INDEX_FILE} ({size:,} bytes)")
+    if not args.query:
+        return
+
+    index = SearchIndex(outdir / INDEX_FILE)
+    _, projects = read_csv(outdir / "projects.csv")
+    by_id = {p.get("id", ""): p for p in projects}
+    team: Dict[str, List[str]] = {}
+    if (outdir / "project_employees.csv").exists():
+        for link in read_csv(outdir / "project_employees.csv")[1]:
+            team.setdefault(link["ProjectID"], []).append(link["EmployeeID"])
+    for pid, score in index.search(args.query, args.top):
+        name = (by_id.get(pid) or {}).get("name", "")
+        print(f"{score:7.3f}  {pid:>8}  {name}")
+        if team.get(pid):
+            print(f"{'':17}team: {', '.join(team[pid])}")
+
+
+if __name__ == "__main__":
+    main()
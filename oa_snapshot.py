@@ -0,0 +1,211 @@
+"""
+In-memory snapshot of the directory data (the three CSVs in Data/).
+
+Loaded once per process (or once in the gunicorn master, see serve.py).
+Tables are held column-wise (oa_columnar.ColumnarTable: dictionary-encoded
+categoricals, array-backed numbers, rows read through dict-like RowViews)
+and indexed for the lookups the directory needs: records by ID, the
+project <-> employee adjacency from the bridge, and sorted range indexes over
+the numeric filter columns (RANGE_COLUMNS):
+
+    snap = current()
+    m = snap.employee_mask(total_years_in_industry=(10, None), hire_date=(None, 20100101))
+    rows = snap.employees_where(m & snap.employees.equals("status", "Active"))
+"""
+import csv
+import hashlib
+import io
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from oa_columnar import ColumnarTable, NumericColumn
+
+DATA_DIR_DEFAULT = Path(__file__).resolve().parent / "Data"
+SNAPSHOT_FILES = {
+    "employees": "employees.csv",
+    "projects": "projects.csv",
+    "links": "project_employees.csv",
+}
+
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+def parse_number(v: Any) -> float:
+    """'12' / '$1,250,000.00' / '12,430' -> float; N/A, '' and other text -> NaN."""
+    m = _NUMBER.search(str(v or "").replace(",", ""))
+    return float(m.group(0)) if m else float("nan")
+
+
+def parse_date(v: Any) -> float:
+    """
+    OpenAsset timestamps ('20181101000000', '20181101') -> yyyymmdd as a float.
+    Excel's scientific-notation damage ('2.02E+13') keeps only a few significant
+    digits, so it and anything without a real month/day are NaN (missing), not
+    a guessed date.
+    """
+    if isinstance(v, str) and "e" in v.lower():
+        return float("nan")
+    n = parse_number(v)
+    if np.isnan(n) or n < 1e7:
+        return float("nan")
+    digits = str(int(n))
+    if len(digits) < 8 or not (1 <= int(digits[4:6]) <= 12 and 1 <= int(digits[6:8]) <= 31):
+        return float("nan")
+    return float(digits[:8])
+
+
+# table -> column -> parser; each becomes a float64 column with a sorted index
+RANGE_COLUMNS: Dict[str, Dict[str, Callable[[Any], float]]] = {
+    "employees": {
+        "total_years_in_industry": parse_number,
+        "current_years_with_this_firm": parse_number,
+        "hire_date": parse_date,
+    },
+    "projects": {
+        "field.year_completed": parse_number,
+        "field.published_square_feet": parse_number,
+        "field.published_project_cost": parse_number,
+    },
+}
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+class RangeIndex:
+    """Typed column plus the row order that sorts it; NaN (missing) rows are left out of the order."""
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+        valid = np.flatnonzero(~np.isnan(values))
+        self.order = valid[np.argsort(values[valid], kind="stable")]
+        self.sorted = values[self.order]
+
+    @classmethod
+    def build(cls, table: ColumnarTable, column: str, parse: Callable[[Any], float]) -> "RangeIndex":
+        col = table.columns.get(column)
+        if isinstance(col, NumericColumn):
+            return cls(col.values)
+        if col is None:
+            return cls(np.full(len(table), np.nan))
+        return cls(np.fromiter((parse(col[i]) for i in range(len(table))), dtype=np.float64, count=len(table)))
+
+    def rows(self, lo: Optional[float] = None, hi: Optional[float] = None) -> np.ndarray:
+        """Row positions with lo <= value <= hi (either bound may be None), in value order."""
+        left = 0 if lo is None else int(np.searchsorted(self.sorted, lo, side="left"))
+        right = len(self.sorted) if hi is None else int(np.searchsorted(self.sorted, hi, side="right"))
+        return self.order[left:right]
+
+    def mask(self, lo: Optional[float] = None, hi: Optional[float] = None) -> np.ndarray:
+        m = np.zeros(len(self.values), dtype=bool)
+        m[self.rows(lo, hi)] = True
+        return m
+
+
+def as_id(v: Any) -> Any:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return v
+
+
+class Snapshot:
+    def __init__(self, data_dir: Path, tables: Dict[str, ColumnarTable], version: str, load_seconds: float):
+        self.data_dir = data_dir
+        self.version = version
+        self.loaded_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.load_seconds = load_seconds
+        self.employees = tables["employees"]
+        self.projects = tables["projects"]
+        self.links = tables["links"]
+
+        self.employee_by_id: Dict[Any, Mapping] = {
+            as_id(e.get("EmployeeID") or e.get("id")): e for e in self.employees
+        }
+        self.project_by_id: Dict[Any, Mapping] = {as_id(p.get("id")): p for p in self.projects}
+        self.projects_by_employee: Dict[Any, List[Any]] = {}
+        self.employees_by_project: Dict[Any, List[Any]] = {}
+        for link in self.links:
+            pid, eid = as_id(link.get("ProjectID")), as_id(link.get("EmployeeID"))
+            self.projects_by_employee.setdefault(eid, []).append(pid)
+            self.employees_by_project.setdefault(pid, []).append(eid)
+
+        self.ranges: Dict[str, Dict[str, RangeIndex]] = {
+            table: {col: RangeIndex.build(getattr(self, table), col, parse) for col, parse in cols.items()}
+            for table, cols in RANGE_COLUMNS.items()
+        }
+
+    def mask(self, table: str, **ranges: Range) -> np.ndarray:
+        """AND of range predicates, e.g. mask("projects", **{"field.year_completed": (2010, None)})."""
+        m = np.ones(len(getattr(self, table)), dtype=bool)
+        for col, (lo, hi) in ranges.items():
+            m &= self.ranges[table][col].mask(lo, hi)
+        return m
+
+    def employee_mask(self, **ranges: Range) -> np.ndarray:
+        return self.mask("employees", **ranges)
+
+    def project_mask(self, **ranges: Range) -> np.ndarray:
+        return self.mask("projects", **ranges)
+
+    def employees_where(self, mask: np.ndarray) -> List[Mapping]:
+        return [self.employees[i] for i in np.flatnonzero(mask)]
+
+    def projects_where(self, mask: np.ndarray) -> List[Mapping]:
+        return [self.projects[i] for i in np.flatnonzero(mask)]
+
+    def employee_projects(self, employee_id: Any) -> List[Mapping]:
+        return [self.project_by_id[p] for p in self.projects_by_employee.get(as_id(employee_id), [])
+                if p in self.project_by_id]
+
+    def project_team(self, project_id: Any) -> List[Mapping]:
+        return [self.employee_by_id[e] for e in self.employees_by_project.get(as_id(project_id), [])
+                if e in self.employee_by_id]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 3),
+            "data_dir": str(self.data_dir),
+            "employees": len(self.employees),
+            "projects": len(self.projects),
+            "links": len(self.links),
+        }
+
+
+def load_snapshot(data_dir: Path = DATA_DIR_DEFAULT) -> Snapshot:
+    """Parse the CSVs; the version is a hash over their bytes, so identical data gives the same version."""
+    t0 = time.perf_counter()
+    data_dir = Path(data_dir)
+    digest = hashlib.sha256()
+    tables: Dict[str, ColumnarTable] = {}
+    for name, fname in SNAPSHOT_FILES.items():
+        raw = (data_dir / fname).read_bytes()
+        digest.update(fname.encode("utf-8") + b"\0" + raw)
+        reader = csv.reader(io.StringIO(raw.decode("utf-8-sig"), newline=""))
+        header = next(reader, [])
+        numeric = {c: p for c, p in RANGE_COLUMNS.get(name, {}).items() if p is parse_number}
+        tables[name] = ColumnarTable(header, list(reader), numeric=numeric)
+    return Snapshot(data_dir, tables, digest.hexdigest()[:16], time.perf_counter() - t0)
+
+
+_current: Optional[Snapshot] = None
+
+
+def current() -> Snapshot:
+    """The process-wide snapshot; loaded from Data/ on first use unless set_current() ran first."""
+    global _current
+    if _current is None:
+        _current = load_snapshot()
+    return _current
+
+
+def set_current(snapshot: Snapshot) -> Snapshot:
+    global _current
+    _current = snapshot
+    return snapshot
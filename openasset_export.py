@@ -3,6 +3,11 @@ import csv
 import time
 import json
 import argparse
+import fnmatch
+import re
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Dict, Iterable, List, Set, Any, Optional, Tuple
 
@@ -10,24 +15,116 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from oa_fieldmap import ALIASES_PATH_DEFAULT, field_mapper
+
 # ========= CONFIG =========
 BASE_URL = "https://perkinseastman.openasset.com/REST/1"
 PAGE_SIZE_DEFAULT = 200
+PROFILE_PATH_DEFAULT = "oa_profile.json"
+PROJECT_FRONT_COLUMNS = ["id", "code", "name", "practice_area", "sub_practice_area", "sub_practice_areas",
+                         "region", "service_type", "studio", "client"]
 TIMEOUT = (5, 30)
 RETRY_CFG = dict(
     total=5, backoff_factor=0.6,
     status_forcelist=[429, 500, 502, 503, 504],
     allowed_methods=["GET"]
 )
+HEDGE_PERCENTILE = 95      # hedge a GET once it runs past this latency percentile...
+HEDGE_BUDGET = 0.05        # ...as long as hedges stay under this fraction of all GETs
+HEDGE_MIN_SAMPLES = 20     # per endpoint template, before hedging kicks in
+HEDGE_WINDOW = 200         # rolling latency samples kept per endpoint template
 
 # ========= HTTP session =========
-def make_session(token: str) -> requests.Session:
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+def endpoint_template(url: str) -> str:
+    """'.../Projects/172/Fields' -> '.../Projects/{id}/Fields' (query string dropped)."""
+    return _NUMERIC_SEGMENT.sub("/{id}", url.split("?", 1)[0])
+
+def _close_response(fut) -> None:
+    if fut.exception() is None:
+        fut.result().close()
+
+class HedgedSession(requests.Session):
+    """
+    Session whose GETs (idempotent) are hedged: once a request has been running
+    longer than the rolling HEDGE_PERCENTILE latency of its endpoint template,
+    one duplicate is sent and whichever finishes first wins. Hedges are capped
+    at `budget` x total GETs; `stats` counts how often they were sent and won.
+    """
+
+    def __init__(self, percentile: float = HEDGE_PERCENTILE, budget: float = HEDGE_BUDGET, max_workers: int = 8):
+        super().__init__()
+        self.percentile = percentile
+        self.budget = budget
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        self._latency: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def _timed_get(self, template: str, url: str, kwargs: Dict[str, Any]) -> requests.Response:
+        t0 = time.perf_counter()
+        r = super().get(url, **kwargs)
+        with self._lock:
+            self._latency.setdefault(template, deque(maxlen=HEDGE_WINDOW)).append(time.perf_counter() - t0)
+        return r
+
+    def _hedge_delay(self, template: str) -> Optional[float]:
+        with self._lock:
+            samples = self._latency.get(template)
+            if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.budget * self.stats["requests"]:
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def get(self, url, **kwargs):
+        template = endpoint_template(url)
+        with self._lock:
+            self.stats["requests"] += 1
+        delay = self._hedge_delay(template)
+        if delay is None:
+            return self._timed_get(template, url, kwargs)
+
+        primary = self._pool.submit(self._timed_get, template, url, kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_budget():
+            return primary.result()
+
+        hedge = self._pool.submit(self._timed_get, template, url, kwargs)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    # the other copy is discarded; release its connection now if it has
+                    # already landed (same wait()), or when it does
+                    for other in (done | pending) - {fut}:
+                        other.add_done_callback(_close_response)
+                    if fut is hedge:
+                        with self._lock:
+                            self.stats["hedge_wins"] += 1
+                    return fut.result()
+        return primary.result()  # both failed: surface the primary's error
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        super().close()
+
+def make_session(token: str, hedge: bool = False, hedge_percentile: float = HEDGE_PERCENTILE,
+                 hedge_budget: float = HEDGE_BUDGET) -> requests.Session:
     if not token:
         raise SystemExit(
             "Set OPENASSET_TOKEN first.\n"
             "PowerShell (this terminal):  $env:OPENASSET_TOKEN = \"285:YOURTOKEN\""
         )
-    s = requests.Session()
+    s = HedgedSession(hedge_percentile, hedge_budget) if hedge else requests.Session()
     s.headers.update({"Authorization": f"OATU {token}"})
     adapter = HTTPAdapter(
         max_retries=Retry(**RETRY_CFG), pool_connections=20, pool_maxsize=20
@@ -80,9 +177,33 @@ def unique_headers(rows: List[Dict[str, Any]]) -> List[str]:
                 seen.append(k)
     return seen
 
+def front_columns(header: List[str], front: List[str]) -> List[str]:
+    """Move the given columns (when present) to the start of the header."""
+    lead = [c for c in front if c in header]
+    return lead + [h for h in header if h not in lead]
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse '--shard i/N' (0 <= i < N)."""
+    try:
+        i, n = (int(x) for x in spec.split("/", 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {spec!r}")
+    if n < 1 or not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"shard index must satisfy 0 <= i < N, got {spec!r}")
+    return i, n
+
+def in_shard(project_id: Any, shard: Optional[Tuple[int, int]]) -> bool:
+    if not shard:
+        return True
+    i, n = shard
+    return int(project_id) % n == i
+
 def write_csv(path: Path, rows: List[Dict[str, Any]], header: List[str]) -> None:
+    # Written next to the destination and renamed into place, so a reader never
+    # sees a truncated or half-written file.
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as f:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
         w.writeheader()
         for r in rows:
@@ -90,72 +211,199 @@ def write_csv(path: Path, rows: List[Dict[str, Any]], header: List[str]) -> None
                 if h not in r:
                     r[h] = ""
             w.writerow(r)
+    os.replace(tmp, path)
+
+# ========= Endpoint capability profile =========
+# Each variant is (label, endpoint, params); "{pid}" is filled in per project.
+PROJECT_FIELDS_VARIANTS: List[Tuple[str, str, Optional[Dict[str, str]]]] = [
+    ("Projects/{pid}/Fields", "Projects/{pid}/Fields", None),
+    ("Projects/{pid}/Fields?includeValues=1", "Projects/{pid}/Fields", {"includeValues": "1"}),
+    ("Projects/{pid}/Fields?withValues=1", "Projects/{pid}/Fields", {"withValues": "1"}),
+    ("Fields?projectId={pid}", "Fields", {"projectId": "{pid}"}),
+    ("Fields?project_id={pid}", "Fields", {"project_id": "{pid}"}),
+]
+FIELDS_CATALOG_VARIANTS: List[Tuple[str, str, Optional[Dict[str, Any]]]] = [
+    ("Fields?limit=1000", "Fields", {"limit": 1000}),   # sometimes returns definitions
+    ("FieldDefinitions?limit=1000", "FieldDefinitions", {"limit": 1000}),
+    ("Fields/Definitions?limit=1000", "Fields/Definitions", {"limit": 1000}),
+    ("Fields", "Fields", None),                         # plain
+]
+
+# Working variant per endpoint family for this tenant; see load_profile()/oa_discover.py.
+PROFILE: Dict[str, Any] = {}
+_profile_dirty = False
+
+def load_profile(path: Path) -> Dict[str, Any]:
+    """Load the capability profile written by oa_discover.py (or a previous export)."""
+    global _profile_dirty
+    PROFILE.clear()
+    _profile_dirty = False
+    if not path.exists():
+        return PROFILE
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as ex:
+        print(f"  ⚠️  Ignoring unreadable profile {path}: {ex}")
+        return PROFILE
+    if isinstance(data, dict) and data.get("base_url") == BASE_URL:
+        PROFILE.update(data)
+    return PROFILE
+
+def save_profile(path: Path, force: bool = False) -> Optional[Path]:
+    """Write PROFILE back to disk if a variant was (re)discovered during this run."""
+    global _profile_dirty
+    if not (_profile_dirty or force):
+        return None
+    PROFILE["base_url"] = BASE_URL
+    PROFILE["probed"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # --shard processes may save at the same time: each writes its own temp file
+    # and renames it into place, so the last writer wins with a complete file.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(PROFILE, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+    _profile_dirty = False
+    return path
+
+def remember_variant(family: str, label: str) -> None:
+    global _profile_dirty
+    if PROFILE.get(family) != label:
+        PROFILE[family] = label
+        _profile_dirty = True
+
+def ordered_variants(variants: List[Tuple[str, str, Optional[Dict]]], chosen: Optional[str]) -> List[Tuple[str, str, Optional[Dict]]]:
+    """Profile-chosen variant first, then the rest in their declared order."""
+    if not chosen:
+        return list(variants)
+    return [v for v in variants if v[0] == chosen] + [v for v in variants if v[0] != chosen]
+
+def resolve_variant(endpoint: str, params: Optional[Dict[str, Any]], **fmt: Any) -> Tuple[str, Dict[str, Any]]:
+    url = f"{BASE_URL}/{endpoint.format(**fmt)}"
+    resolved = {k: (v.format(**fmt) if isinstance(v, str) else v) for k, v in (params or {}).items()}
+    return url, resolved
+
+def useful_field_rows(data: Any) -> List[Dict]:
+    # Accept if entries have 'id' and one of value containers
+    if not isinstance(data, list):
+        return []
+    return [d for d in data if isinstance(d, dict) and "id" in d]
+
+def catalog_from(data: Any) -> Dict[int, str]:
+    cat: Dict[int, str] = {}
+    if not isinstance(data, list):
+        return cat
+    for row in data:
+        if isinstance(row, dict) and "id" in row and "name" in row:
+            cat[int(row["id"])] = str(row["name"])
+    return cat
+
+def read_csv(path: Path) -> Tuple[List[str], List[Dict[str, str]]]:
+    with path.open("r", newline="", encoding="utf-8") as f:
+        r = csv.DictReader(f)
+        rows = list(r)
+        return list(r.fieldnames or []), rows
+
+# ========= Field projection =========
+# Per-entity column allowlist from --columns; see export_columns.json.
+# Patterns are fnmatch-style and apply to top-level keys (before flattening),
+# so keeping "education_grid" keeps all of its flattened columns.
+PROJECTION: Dict[str, Dict[str, Any]] = {}
+ALWAYS_KEEP = {"id"}
+DERIVED_COLUMNS = {"EmployeeID"}  # filled in by the exporter, as are the field_aliases.json targets
+
+def load_projection(path: Path) -> Dict[str, Dict[str, Any]]:
+    PROJECTION.clear()
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    for entity, patterns in data.items():
+        if not isinstance(patterns, list) or not patterns:
+            continue
+        patterns = [str(p) for p in patterns]
+        # Ask the API for a trimmed payload only when every pattern that can
+        # come from the record itself is a literal name (field.* values come
+        # from the Fields endpoint, not the detail payload).
+        derived = DERIVED_COLUMNS | set(field_mapper().targets)
+        literal = [p for p in patterns if not p.startswith("field.") and p not in derived]
+        display = None
+        if literal and not any(ch in p for p in literal for ch in "*?["):
+            display = ",".join(sorted(set(literal) | ALWAYS_KEEP))
+        PROJECTION[entity] = {
+            "match": re.compile("|".join(fnmatch.translate(p) for p in patterns)),
+            "display": display,
+        }
+    return PROJECTION
+
+def projection_params(entity: str) -> Dict[str, str]:
+    spec = PROJECTION.get(entity)
+    if not spec or not spec["display"]:
+        return {}
+    return {"displayFields": spec["display"]}
+
+def project_row(row: Dict[str, Any], entity: str) -> Dict[str, Any]:
+    """Drop keys outside the entity's allowlist (no-op without --columns); derived columns always stay."""
+    spec = PROJECTION.get(entity)
+    if not spec:
+        return row
+    match = spec["match"].match
+    keep = ALWAYS_KEEP | DERIVED_COLUMNS | set(field_mapper().targets)
+    return {k: v for k, v in row.items() if k in keep or match(k)}
 
 # ========= API wrappers =========
 def fetch_projects_list(session: requests.Session, page_size: int) -> List[Dict]:
     return [p for p in get_paginated(session, "Projects", page_size)]
 
 def fetch_project_detail(session: requests.Session, project_id: int) -> Dict[str, Any]:
-    r = session.get(f"{BASE_URL}/Projects/{project_id}", timeout=TIMEOUT)
+    r = session.get(f"{BASE_URL}/Projects/{project_id}",
+                    params=projection_params("projects"),
+                    timeout=TIMEOUT)
     r.raise_for_status()
-    return r.json() or {}
+    return project_row(r.json() or {}, "projects")
 
 def fetch_project_fields_raw_variants(session: requests.Session, project_id: int) -> Optional[List[Dict]]:
     """
     Try variants that returned 'values' + 'id' in your discovery.
     We need a list of dicts containing at least 'id' and ('value' or 'values' or 'rows').
+    The variant recorded in the capability profile is tried first; a 200 from it is
+    authoritative, and the remaining variants are only probed when it fails.
     """
-    variants = [
-        (f"{BASE_URL}/Projects/{project_id}/Fields", None),
-        (f"{BASE_URL}/Projects/{project_id}/Fields", {"includeValues": "1"}),
-        (f"{BASE_URL}/Projects/{project_id}/Fields", {"withValues": "1"}),
-        (f"{BASE_URL}/Fields", {"projectId": str(project_id)}),
-        (f"{BASE_URL}/Fields", {"project_id": str(project_id)}),
-    ]
-    for url, params in variants:
+    chosen = PROFILE.get("project_fields")
+    for label, endpoint, params in ordered_variants(PROJECT_FIELDS_VARIANTS, chosen):
+        url, params = resolve_variant(endpoint, params, pid=project_id)
         try:
-            r = session.get(url, params=params or {}, timeout=TIMEOUT)
+            r = session.get(url, params=params, timeout=TIMEOUT)
             if r.status_code == 404:
                 continue
             r.raise_for_status()
-            data = r.json()
-            if isinstance(data, list) and data:
-                # Accept if entries have 'id' and one of value containers
-                useful = [d for d in data if isinstance(d, dict) and "id" in d]
-                if useful:
-                    return useful
+            useful = useful_field_rows(r.json())
         except requests.RequestException:
             continue
+        if useful or label == chosen:
+            remember_variant("project_fields", label)
+            return useful or None
     return None
 
 def fetch_fields_catalog(session: requests.Session) -> Dict[int, str]:
     """
-    Fetch global field definitions (ID -> Name). Try a few common endpoints.
+    Fetch global field definitions (ID -> Name). Try a few common endpoints,
+    starting with the one recorded in the capability profile.
     We accept any list of dicts with 'id' and 'name'.
     """
-    attempts = [
-        (f"{BASE_URL}/Fields", {"limit": 1000}),         # sometimes returns definitions
-        (f"{BASE_URL}/FieldDefinitions", {"limit": 1000}),
-        (f"{BASE_URL}/Fields/Definitions", {"limit": 1000}),
-        (f"{BASE_URL}/Fields", None),                    # plain
-    ]
-    for url, params in attempts:
+    chosen = PROFILE.get("fields_catalog")
+    for label, endpoint, params in ordered_variants(FIELDS_CATALOG_VARIANTS, chosen):
+        url, params = resolve_variant(endpoint, params)
         try:
-            r = session.get(url, params=params or {}, timeout=TIMEOUT)
+            r = session.get(url, params=params, timeout=TIMEOUT)
             if r.status_code == 404:
                 continue
             r.raise_for_status()
-            data = r.json()
-            if not isinstance(data, list):
-                continue
-            cat: Dict[int, str] = {}
-            for row in data:
-                if isinstance(row, dict) and "id" in row and "name" in row:
-                    cat[int(row["id"])] = str(row["name"])
-            if cat:
-                return cat
+            cat = catalog_from(r.json())
         except requests.RequestException:
             continue
+        if cat:
+            remember_variant("fields_catalog", label)
+            return cat
     # Fallback: no catalog found
     return {}
 
@@ -179,16 +427,18 @@ def normalize_field_value(item: Dict[str, Any]) -> str:
         return json.dumps(tbl, ensure_ascii=False)
     return ""
 
-def fields_id_value_map(session: requests.Session, project_id: int) -> Dict[str, str]:
+def fields_id_value_map(session: requests.Session, project_id: int,
+                        name_by_id: Optional[Dict[int, str]] = None) -> Dict[str, str]:
     """
     Return a dict of {'field.<name_normalized>': 'value'} for one project,
     using a global catalog (id->name) if available; otherwise fallback to 'field.id_<id>'.
+    Pass the catalog in when exporting many projects; it is fetched here otherwise.
     """
     raw = fetch_project_fields_raw_variants(session, project_id)
     if not raw:
         return {}
-    # Try to build or fetch a global catalog
-    name_by_id = fetch_fields_catalog(session)
+    if name_by_id is None:
+        name_by_id = fetch_fields_catalog(session)
 
     out: Dict[str, str] = {}
     for item in raw:
@@ -212,41 +462,72 @@ def fields_id_value_map(session: requests.Session, project_id: int) -> Dict[str,
         out[f"field.{field_name}"] = val
     return out
 
-def fetch_project_employee_ids(session: requests.Session, project_id: int, page_size: int) -> List[int]:
-    ids: List[int] = []
+def fetch_project_employees(session: requests.Session, project_id: int, page_size: int) -> List[Dict[str, Any]]:
+    """
+    Employees linked to a project, with the roles they hold on *this* project.
+    The endpoint keys roles by project ID: {'id': 12, 'roles': {'172': [{...}, ...]}}.
+    """
+    links: List[Dict[str, Any]] = []
     for e in get_paginated(session, f"Projects/{project_id}/Employees", page_size):
         if isinstance(e, dict) and "id" in e:
-            ids.append(e["id"])
-    return ids
+            roles = (e.get("roles") or {}).get(str(project_id)) or []
+            links.append({"id": e["id"], "roles": [r for r in roles if isinstance(r, dict)]})
+    return links
+
+def fetch_project_employee_ids(session: requests.Session, project_id: int, page_size: int) -> List[int]:
+    return [e["id"] for e in fetch_project_employees(session, project_id, page_size)]
+
+# ========= Project roles (dictionary-encoded in the bridge) =========
+ROLES_FILE = "project_roles.csv"
+BRIDGE_HEADER = ["ProjectID", "EmployeeID", "RoleIDs", "RoleAttributes"]
+ROLE_NAME_KEYS = ("name", "role", "title", "employee_role")
+
+def load_role_codes(path: Path) -> Dict[str, int]:
+    """Role name -> RoleID from a previous project_roles.csv, so IDs stay stable across runs."""
+    if not path.exists():
+        return {}
+    _, rows = read_csv(path)
+    return {r["Role"]: int(r["RoleID"]) for r in rows if r.get("RoleID")}
+
+def role_code(codes: Dict[str, int], name: str) -> int:
+    if name not in codes:
+        codes[name] = max(codes.values(), default=0) + 1
+    return codes[name]
+
+def role_rows(codes: Dict[str, int]) -> List[Dict[str, Any]]:
+    return [{"RoleID": c, "Role": n} for n, c in sorted(codes.items(), key=lambda kv: kv[1])]
+
+def bridge_row(project_id: Any, link: Dict[str, Any], codes: Dict[str, int]) -> Dict[str, Any]:
+    """
+    One bridge row per (project, employee). RoleIDs is '; '-joined codes into
+    project_roles.csv; RoleAttributes keeps every other key of each role (same
+    order as RoleIDs) as compact JSON, or '' when roles carry nothing else.
+    """
+    ids: List[str] = []
+    attrs: List[Dict[str, Any]] = []
+    for role in link.get("roles") or []:
+        name_key = next((k for k in ROLE_NAME_KEYS if role.get(k) not in (None, "")), None)
+        name = str(role[name_key]) if name_key else json.dumps(role, sort_keys=True, ensure_ascii=False)
+        ids.append(str(role_code(codes, name)))
+        attrs.append({k: v for k, v in role.items() if k != name_key})
+    return {
+        "ProjectID": project_id,
+        "EmployeeID": link["id"],
+        "RoleIDs": "; ".join(ids),
+        "RoleAttributes": json.dumps(attrs, ensure_ascii=False, separators=(",", ":")) if any(attrs) else "",
+    }
 
 def fetch_employee(session: requests.Session, emp_id: int) -> Dict[str, Any]:
     r = session.get(f"{BASE_URL}/Employees/{emp_id}",
-                    params={"withHeroImage": 0, "files": 0},
+                    params={"withHeroImage": 0, "files": 0, **projection_params("employees")},
                     timeout=TIMEOUT)
     r.raise_for_status()
-    return r.json() or {}
+    return project_row(r.json() or {}, "employees")
 
 # ========= extraction of friendly columns =========
-# ========= extraction of friendly columns =========
-ALIASES = {
-    "practice_area": {"practice area", "practice_area", "practice", "market_sector", "market sector"},
-    "sub_practice_areas": {"sub practice area", "sub_practice_areas"},
-    "region": {"Region", "geographic_region", "geographic region", "office_region", "office region"},
-}
-
 def extract_friendly_columns(src: Dict[str, Any]) -> Dict[str, Any]:
-    out = {"practice_area": "", "sub_practice_areas": "", "region": ""}
-    for k, v in src.items():
-        if not k.startswith("field."):
-            continue
-        base = k[len("field."):].replace("_", " ").lower()
-        if not out["practice_area"] and any(a in base for a in ALIASES["practice_area"]):
-            out["practice_area"] = v
-        if not out["sub_practice_areas"] and any(a in base for a in ALIASES["sub_practice_areas"]):
-            out["sub_practice_areas"] = v
-        if not out["region"] and any(a in base for a in ALIASES["region"]):
-            out["region"] = v
-    return out
+    """practice_area, region, ... from field.* keys; aliases come from field_aliases.json."""
+    return field_mapper().extract(src)
 
 
 # ========= Main =========
@@ -260,31 +541,69 @@ def main():
                         help=f"Page size for pagination (default: {PAGE_SIZE_DEFAULT})")
     parser.add_argument("--dump", action="store_true",
                         help="Dump raw sample JSONs for debugging")
+    parser.add_argument("--profile", type=str, default=PROFILE_PATH_DEFAULT,
+                        help=f"Endpoint capability profile from oa_discover.py (default: {PROFILE_PATH_DEFAULT})")
+    parser.add_argument("--shard", type=parse_shard, default=None, metavar="i/N",
+                        help="Only export projects with id %% N == i (combine shard outdirs with oa_merge.py)")
+    parser.add_argument("--aliases", type=str, default=str(ALIASES_PATH_DEFAULT), metavar="FILE",
+                        help="JSON map of friendly project column -> field name aliases (default: field_aliases.json)")
+    parser.add_argument("--columns", type=str, default=None, metavar="FILE",
+                        help="JSON column allowlist per entity (e.g. export_columns.json); trims requests and CSVs")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Hedge slow GETs: send one duplicate once a call runs past the endpoint's latency percentile")
+    parser.add_argument("--hedge-percentile", type=float, default=HEDGE_PERCENTILE,
+                        help=f"Latency percentile that triggers a hedge (default: {HEDGE_PERCENTILE})")
+    parser.add_argument("--hedge-budget", type=float, default=HEDGE_BUDGET,
+                        help=f"Max hedges as a fraction of all GETs (default: {HEDGE_BUDGET})")
+    parser.add_argument("--collaborators", type=int, default=0, metavar="K",
+                        help="Also write collaborators.csv with the top K co-workers per employee (0 = off)")
+    parser.add_argument("--aggregates", action="store_true",
+                        help="Also write employee_experience.csv (per-employee project counts by practice area/region, "
+                             "years); incremental with --changes-from")
+    parser.add_argument("--search-index", action="store_true",
+                        help="Also write search_index.bin (BM25 over project text; query with oa_search.py)")
+    parser.add_argument("--publish", action="store_true",
+                        help="Also write .gz/.br variants and manifest.json (hashes, sizes, row counts)")
+    parser.add_argument("--changes-from", type=str, default=None, metavar="DIR",
+                        help="Previous snapshot directory; writes changes.ndjson (added/removed/changed rows) to outdir")
     args = parser.parse_args()
 
     token = os.getenv("OPENASSET_TOKEN", "")
-    session = make_session(token)
+    session = make_session(token, args.hedge, args.hedge_percentile, args.hedge_budget)
+    profile_path = Path(args.profile)
+    load_profile(profile_path)
+    field_mapper(Path(args.aliases))
+    if args.columns:
+        load_projection(Path(args.columns))
 
     outdir = Path(args.outdir)
     out_projects = outdir / "projects.csv"
     out_employees = outdir / "employees.csv"
     out_bridge = outdir / "project_employees.csv"
+    out_roles = outdir / ROLES_FILE
 
     print("== OpenAsset Export ==")
     print(f"- Outdir    : {outdir.resolve()}")
     print(f"- Page size : {args.page_size}")
-    print(f"- Test limit: {args.test if args.test else 'ALL'}\n")
+    print(f"- Test limit: {args.test if args.test else 'ALL'}")
+    print(f"- Shard     : {'%d/%d' % args.shard if args.shard else 'none'}")
+    print(f"- Columns   : {args.columns or 'all'}")
+    print(f"- Profile   : {profile_path} ({'loaded' if PROFILE else 'none, will probe'})\n")
 
     # 1) Project LIST
     print("Fetching project LIST...")
     t0 = time.time()
     projects_list = fetch_projects_list(session, args.page_size)
     print(f"Got {len(projects_list)} projects in {time.time()-t0:0.1f}s.")
+    if args.shard:
+        projects_list = [p for p in projects_list if p.get("id") is not None and in_shard(p["id"], args.shard)]
+        print(f"Shard {args.shard[0]}/{args.shard[1]} keeps {len(projects_list)} projects.")
 
     # 2) Enrich subset with DETAIL + FIELDS(ID->NAME)
     print("Fetching project DETAIL + FIELDS for subset...")
     cutoff = args.test if args.test and args.test > 0 else len(projects_list)
     enriched_rows: List[Dict[str, Any]] = []
+    name_by_id = fetch_fields_catalog(session)  # global, so fetched once per run
 
     for i, p in enumerate(projects_list[:cutoff], start=1):
         pid = p.get("id")
@@ -297,7 +616,7 @@ def main():
             detail = {}
 
         try:
-            fields_named = fields_id_value_map(session, pid)
+            fields_named = fields_id_value_map(session, pid, name_by_id)
         except requests.RequestException as ex:
             print(f"  ⚠️  Project {pid} fields error: {ex}")
             fields_named = {}
@@ -306,7 +625,8 @@ def main():
         merged.update(p)             # list fields
         merged.update(detail)        # detail fields
         merged.update(fields_named)  # field.<normalized name> = value
-        merged.update(extract_friendly_columns(merged))  # practice_area, region
+        merged.update(extract_friendly_columns(merged))  # practice_area, region, service_type, ...
+        merged = project_row(merged, "projects")
 
         enriched_rows.append(merged)
 
@@ -317,33 +637,30 @@ def main():
 
     # 3) Flatten for CSV + build header (bring key cols to front)
     flat_projects = [flatten(x) for x in enriched_rows]
-    proj_header = unique_headers(flat_projects)
-    front = [c for c in ["id", "code", "name", "practice_area","sub_practice_area","region"] if c in proj_header]
-    for c in front:
-        proj_header.remove(c)
-    proj_header = front + proj_header
+    proj_header = front_columns(unique_headers(flat_projects), PROJECT_FRONT_COLUMNS)
 
     if args.dump and enriched_rows:
         sample_id = enriched_rows[0]["id"]
         with (outdir / "sample_project_detail.json").open("w", encoding="utf-8") as f:
             json.dump(fetch_project_detail(session, sample_id), f, indent=2)
 
-    # 4) Build bridge (ProjectID ↔ EmployeeID)
+    # 4) Build bridge (ProjectID ↔ EmployeeID, with per-project roles)
     print("Building project-employee links...")
     bridge_rows: List[Dict[str, Any]] = []
     emp_ids: Set[int] = set()
+    role_codes = load_role_codes(Path(args.changes_from or outdir) / ROLES_FILE)
     for i, p in enumerate(projects_list[:cutoff], start=1):
         pid = p.get("id")
         if pid is None:
             continue
         try:
-            ids = fetch_project_employee_ids(session, pid, args.page_size)
+            links = fetch_project_employees(session, pid, args.page_size)
         except requests.RequestException as ex:
             print(f"  ⚠️  Project {pid} employees error: {ex}")
-            ids = []
-        for eid in ids:
-            bridge_rows.append({"ProjectID": pid, "EmployeeID": eid})
-            emp_ids.add(eid)
+            links = []
+        for link in links:
+            bridge_rows.append(bridge_row(pid, link, role_codes))
+            emp_ids.add(link["id"])
         if i % 10 == 0:
             print(f"  Linked {i}/{cutoff} projects... (unique employees so far: {len(emp_ids)})")
         if i % 50 == 0:
@@ -371,18 +688,67 @@ def main():
     if "EmployeeID" not in emp_header:
         emp_header = ["EmployeeID"] + [h for h in emp_header if h != "EmployeeID"]
 
-    # 6) Write CSVs
+    # 6) Change feed against the previous snapshot (read before outdir is overwritten)
+    changes: Optional[List[Dict[str, Any]]] = None
+    if args.changes_from:
+        import oa_changes
+        prev = oa_changes.snapshot_digests(Path(args.changes_from))
+        changes = list(oa_changes.diff_snapshot(prev, {
+            "projects": flat_projects, "employees": flat_employees, "links": bridge_rows,
+            "roles": role_rows(role_codes),
+        }))
+        counts = oa_changes.write_change_feed(outdir / "changes.ndjson", changes)
+        print(f"Change feed: +{counts['added']} -{counts['removed']} ~{counts['changed']} -> {outdir / 'changes.ndjson'}")
+
+    # 7) Write CSVs
     print("Writing CSVs...")
     outdir.mkdir(parents=True, exist_ok=True)
     write_csv(out_projects, flat_projects, proj_header)
     write_csv(out_employees, flat_employees, emp_header)
-    write_csv(out_bridge, bridge_rows, ["ProjectID", "EmployeeID"])
+    write_csv(out_bridge, bridge_rows, BRIDGE_HEADER)
+    write_csv(out_roles, role_rows(role_codes), ["RoleID", "Role"])
+
+    if args.collaborators:
+        import oa_cograph
+        n = oa_cograph.build_collaborators(outdir, args.collaborators, bridge_rows)
+        print(f"Co-worker graph: {n} collaborator rows -> {outdir / oa_cograph.COLLABORATORS_FILE}")
+
+    if args.aggregates:
+        import oa_aggregates
+        # build_aggregates reads the old table before overwriting it, so the previous
+        # snapshot may be outdir itself
+        n, redone = oa_aggregates.build_aggregates(
+            outdir, flat_employees, flat_projects, bridge_rows,
+            previous=Path(args.changes_from) if args.changes_from else None, changes=changes,
+        )
+        print(f"Experience aggregates: {n} employees ({redone} recomputed) -> {outdir / oa_aggregates.AGGREGATES_FILE}")
+
+    if args.search_index:
+        import oa_search
+        size = oa_search.build_search_index(outdir, flat_projects)
+        print(f"Search index: {size:,} bytes -> {outdir / oa_search.INDEX_FILE}")
+
+    if args.publish:
+        import oa_publish
+        if oa_publish.brotli is None:
+            print("  ⚠️  brotli not installed; writing gzip variants only (pip install brotli)")
+        manifest = oa_publish.publish_outputs(outdir)
+        print(f"Published {len(manifest['files'])} files + {outdir / oa_publish.MANIFEST_NAME}")
+
+    if isinstance(session, HedgedSession):
+        st = session.stats
+        print(f"Hedging: {st['hedged']} hedge(s) over {st['requests']} GETs, {st['hedge_wins']} won")
+
+    if save_profile(profile_path):
+        print(f"Updated capability profile: {profile_path}")
+    session.close()
 
     print("Done:")
     print(f" - {out_projects}")
     print(f" - {out_employees}")
     print(f" - {out_bridge}")
-    print("Tip: if practice_area/region are still blank, open the CSV and look for field.* columns to see actual names to alias.")
+    print(f" - {out_roles}")
+    print("Tip: if practice_area/region are still blank, open the CSV and add the actual field.* names to field_aliases.json.")
     
 if __name__ == "__main__":
     main()
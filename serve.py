@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Production launcher for the Employee Directory backend (gunicorn, preload-then-fork).
+
+The master process loads and indexes the Data/ snapshot once, moves it out of
+the cyclic GC's reach with gc.freeze(), and only then forks the workers. The
+workers share those pages copy-on-write instead of each parsing the CSVs, so
+cold start is one load and memory stays flat as --workers grows.
+
+    python serve.py --workers 4 --bind 0.0.0.0:8000
+    python serve.py --app app:app --data-dir Data
+
+GET /ready reports the snapshot version, load time and the worker PID.
+Use start.py for the Flask debug server during development.
+"""
+import argparse
+import gc
+import importlib
+import os
+import time
+from pathlib import Path
+
+from flask import jsonify
+from gunicorn.app.base import BaseApplication
+
+import oa_snapshot
+
+READY_PATH = "/ready"
+
+
+class DirectoryServer(BaseApplication):
+    def __init__(self, application, options=None):
+        self.options = options or {}
+        self.application = application
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self):
+        return self.application
+
+
+def import_app(spec: str):
+    module_name, _, attr = spec.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr or "app")
+
+
+def install_ready_route(app, started: float) -> None:
+    if any(rule.rule == READY_PATH for rule in app.url_map.iter_rules()):
+        return
+
+    def ready():
+        snap = oa_snapshot.current()
+        return jsonify({
+            "status": "ready",
+            **snap.status(),
+            "master_uptime_seconds": round(time.time() - started, 1),
+            "pid": os.getpid(),
+        })
+
+    app.add_url_rule(READY_PATH, "oa_ready", ready)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Employee Directory with gunicorn (preload-then-fork)")
+    parser.add_argument("--app", type=str, default="app:app",
+                        help="WSGI app as module:attribute (default: app:app)")
+    parser.add_argument("--data-dir", type=str, default=str(oa_snapshot.DATA_DIR_DEFAULT),
+                        help="Snapshot directory with the three CSVs (default: Data/)")
+    parser.add_argument("--bind", type=str, default=os.getenv("BIND", "0.0.0.0:8000"),
+                        help="Address to bind (default: 0.0.0.0:8000 or $BIND)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")),
+                        help="Number of worker processes (default: 2 or $WEB_CONCURRENCY)")
+    parser.add_argument("--timeout", type=int, default=600,
+                        help="Worker timeout in seconds (default: 600)")
+    args = parser.parse_args()
+
+    started = time.time()
+    print(f"Loading snapshot from {Path(args.data_dir).resolve()}...")
+    snap = oa_snapshot.set_current(oa_snapshot.load_snapshot(Path(args.data_dir)))
+    print(f"  version {snap.version}: {len(snap.employees)} employees, {len(snap.projects)} projects, "
+          f"{len(snap.links)} links in {snap.load_seconds:0.2f}s")
+
+    try:
+        app = import_app(args.app)
+    except (ImportError, AttributeError) as e:
+        raise SystemExit(f"ERROR: Could not import {args.app}: {e}")
+    install_ready_route(app, started)
+
+    # Everything allocated so far is long-lived: collect once, then freeze it so
+    # GC passes in the workers never touch (and thereby copy) the shared pages.
+    gc.collect()
+    gc.freeze()
+
+    DirectoryServer(app, {
+        "bind": args.bind,
+        "workers": args.workers,
+        "timeout": args.timeout,
+        "preload_app": True,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()